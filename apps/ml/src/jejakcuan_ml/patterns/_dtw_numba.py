@@ -0,0 +1,132 @@
+"""DTW kernels, JIT-compiled with numba when it is installed.
+
+Without numba the same functions run as plain Python, so results never
+depend on the optional dependency being present.
+"""
+
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+numba: ModuleType | None
+try:
+    import numba as _numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+else:
+    numba = _numba
+
+HAS_NUMBA = numba is not None
+prange: Any = numba.prange if numba is not None else range
+
+
+def _jit(parallel: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Compile with numba if available, else leave the function unchanged.
+
+    Args:
+        parallel: Run ``prange`` loops on multiple threads
+
+    Returns:
+        Decorator
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        if numba is None:
+            return func
+        compiled: Callable[..., Any] = numba.njit(cache=True, parallel=parallel)(func)
+        return compiled
+
+    return decorate
+
+
+@_jit()
+def dtw_core(a: NDArray[np.float64], b: NDArray[np.float64], band: int, cutoff: float) -> float:
+    """DTW distance with absolute-difference cost over two rolling rows.
+
+    Uses PrunedDTW-style column pruning: costs are non-negative, so a cell
+    above ``cutoff`` can only feed cells above it. Each row therefore starts
+    at the first column of the previous row still within the cutoff, and
+    stops once it has passed the previous row's last such column and its
+    own running value exceeds the cutoff. A row with no surviving cell
+    abandons the sweep. With an infinite cutoff nothing is pruned.
+
+    Args:
+        a: First sequence (float64)
+        b: Second sequence (float64)
+        band: Warping window; negative for no constraint
+        cutoff: Distances above this are not needed exactly
+
+    Returns:
+        DTW distance, or inf when it exceeds ``cutoff`` or the band cannot
+        reach the end cell
+    """
+    n = a.shape[0]
+    m = b.shape[0]
+    if band < 0:
+        band = max(n, m)
+
+    prev = np.full(m + 1, np.inf)
+    curr = np.full(m + 1, np.inf)
+    prev[0] = 0.0
+    # First and last columns of the previous row within the cutoff
+    lo = 0
+    hi = 0
+
+    for i in range(1, n + 1):
+        curr[:] = np.inf
+        ai = a[i - 1]
+        next_lo = -1
+        next_hi = -1
+        for j in range(max(1, lo, i - band), min(m + 1, i + band + 1)):
+            if j > hi + 1 and curr[j - 1] > cutoff:
+                break  # Only the pruned left neighbour could reach this cell
+            best = prev[j - 1]  # match
+            if prev[j] < best:  # insertion
+                best = prev[j]
+            if curr[j - 1] < best:  # deletion
+                best = curr[j - 1]
+            curr[j] = abs(ai - b[j - 1]) + best
+            if curr[j] <= cutoff:
+                if next_lo < 0:
+                    next_lo = j
+                next_hi = j
+        if next_lo < 0:
+            return np.inf
+        lo = next_lo
+        hi = next_hi
+        prev, curr = curr, prev
+
+    if prev[m] > cutoff:
+        return np.inf
+    return float(prev[m])
+
+
+@_jit(parallel=True)
+def dtw_batch(
+    windows: NDArray[np.float64],
+    template: NDArray[np.float64],
+    candidates: NDArray[np.intp],
+    band: int,
+    cutoff: float,
+) -> NDArray[np.float64]:
+    """DTW distances from several windows to one template.
+
+    Windows are independent, so with numba they are spread across threads.
+
+    Args:
+        windows: 2-D array of candidate windows, one per row
+        template: Template sequence
+        candidates: Row indices of ``windows`` to compare
+        band: Warping window; negative for no constraint
+        cutoff: Distances above this are not needed exactly
+
+    Returns:
+        ``dtw_core`` distance for each candidate, in order
+    """
+    out = np.empty(candidates.shape[0])
+    for k in prange(candidates.shape[0]):
+        out[k] = dtw_core(windows[candidates[k]], template, band, cutoff)
+    return out
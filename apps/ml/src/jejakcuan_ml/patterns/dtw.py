@@ -1,13 +1,43 @@
 """Dynamic Time Warping for pattern matching in stock data."""
 
+import bisect
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 from numpy.typing import NDArray
 
+from ._dtw_numba import dtw_batch, dtw_core
+
+
+def _keogh_envelope(template: NDArray[Any], radius: int) -> tuple[NDArray[Any], NDArray[Any]]:
+    """Upper and lower LB_Keogh envelopes of a template.
+
+    Args:
+        template: Template sequence
+        radius: Warping band radius
+
+    Returns:
+        (upper, lower) running max/min over ``template[i - radius : i + radius + 1]``
+    """
+    padded = np.pad(template, radius, mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1)
+    return windows.max(axis=1), windows.min(axis=1)
+
+
+# Candidate match before deduplication; "pattern" indexes the searched patterns
+_MATCH_DTYPE = np.dtype(
+    [
+        ("pattern", np.intp),
+        ("similarity", np.float64),
+        ("start", np.intp),
+        ("end", np.intp),
+        ("distance", np.float64),
+    ]
+)
+
 
 class PatternType(str, Enum):
     """Types of chart patterns."""
@@ -60,6 +90,9 @@ class PatternLibrary:
     def __init__(self) -> None:
         """Initialize library with common patterns."""
         self.patterns: list[Pattern] = []
+        # (id(template), window_size) -> (template, resampled template).
+        # Holding the template keeps its id from being reused while cached.
+        self._resampled: dict[tuple[int, int], tuple[NDArray[Any], NDArray[Any]]] = {}
         self._load_common_patterns()
 
     def _load_common_patterns(self) -> None:
@@ -180,6 +213,33 @@ class PatternLibrary:
         """Get all patterns of a specific type."""
         return [p for p in self.patterns if p.pattern_type == pattern_type]
 
+    def resampled_template(self, pattern: Pattern, window_size: int) -> NDArray[Any]:
+        """Get a pattern's template linearly resampled to ``window_size`` points.
+
+        Results are memoized per template array, so templates must not be
+        modified in place once searched for.
+
+        Args:
+            pattern: Pattern whose template to resample (need not be in the library)
+            window_size: Number of points
+
+        Returns:
+            Resampled template
+        """
+        key = (id(pattern.template), window_size)
+        cached = self._resampled.get(key)
+        if cached is not None:
+            return cached[1]
+
+        template = pattern.template
+        resampled: NDArray[Any] = np.interp(
+            np.linspace(0, 1, window_size),
+            np.linspace(0, 1, len(template)),
+            template,
+        )
+        self._resampled[key] = (template, resampled)
+        return resampled
+
 
 class DTWPatternMatcher:
     """Match price patterns using Dynamic Time Warping."""
@@ -188,15 +248,29 @@ class DTWPatternMatcher:
         self,
         window_sizes: list[int] | None = None,
         similarity_threshold: float = 0.7,
+        lb_prefilter: bool = True,
+        warping_band_ratio: float = 0.25,
+        precision: Literal["fp64", "fp32"] = "fp64",
     ) -> None:
         """Initialize matcher.
 
         Args:
             window_sizes: Window sizes to search for patterns
             similarity_threshold: Minimum similarity to report match
+            lb_prefilter: Skip DTW for windows whose LB_Keogh bound already
+                rules out a match (results are identical either way)
+            warping_band_ratio: Sakoe-Chiba band radius as a fraction of the
+                window size; narrower bands are faster but allow less warping
+            precision: Storage precision of normalized windows and templates in
+                ``find_patterns``. "fp32" halves their memory traffic; DTW
+                still accumulates in float64, but similarities can differ
+                from "fp64" in the last few float32 digits
         """
         self.window_sizes = window_sizes or [15, 20, 30, 40, 50]
         self.similarity_threshold = similarity_threshold
+        self.lb_prefilter = lb_prefilter
+        self.warping_band_ratio = warping_band_ratio
+        self.precision = precision
         self.library = PatternLibrary()
 
     def dtw_distance(
@@ -204,6 +278,7 @@ class DTWPatternMatcher:
         seq1: NDArray[Any],
         seq2: NDArray[Any],
         window: int | None = None,
+        cutoff: float = np.inf,
     ) -> float:
         """Compute DTW distance between two sequences.
 
@@ -211,38 +286,30 @@ class DTWPatternMatcher:
             seq1: First sequence
             seq2: Second sequence
             window: Warping window constraint (None for no constraint)
+            cutoff: Stop early and return inf once the distance must exceed this
 
         Returns:
             DTW distance (lower = more similar)
         """
-        n, m = len(seq1), len(seq2)
-
-        # Initialize cost matrix
-        dtw = np.full((n + 1, m + 1), np.inf)
-        dtw[0, 0] = 0
-
-        # Fill DTW matrix
-        for i in range(1, n + 1):
-            j_start = max(1, i - window) if window else 1
-            j_end = min(m + 1, i + window + 1) if window else m + 1
-
-            for j in range(j_start, j_end):
-                cost = abs(seq1[i - 1] - seq2[j - 1])
-                dtw[i, j] = cost + min(
-                    dtw[i - 1, j],  # insertion
-                    dtw[i, j - 1],  # deletion
-                    dtw[i - 1, j - 1],  # match
-                )
-
-        return float(dtw[n, m])
+        return float(
+            dtw_core(
+                np.ascontiguousarray(seq1, dtype=np.float64),
+                np.ascontiguousarray(seq2, dtype=np.float64),
+                window if window else -1,
+                cutoff,
+            )
+        )
 
     def normalize_sequence(self, seq: NDArray[Any]) -> NDArray[Any]:
         """Normalize sequence to 0-1 range."""
-        min_val = np.min(seq)
-        max_val = np.max(seq)
-        if max_val - min_val < 1e-10:
+        min_val = seq.min()
+        span = seq.max() - min_val
+        if span < 1e-10:
             return np.zeros_like(seq)
-        return (seq - min_val) / (max_val - min_val)
+        # One output buffer, scaled in place (integer input is promoted to float)
+        normalized: NDArray[Any] = np.subtract(seq, min_val, dtype=np.result_type(seq, 1.0))
+        normalized /= span
+        return normalized
 
     def find_patterns(
         self,
@@ -261,96 +328,189 @@ class DTWPatternMatcher:
         if patterns is None:
             patterns = self.library.patterns
 
-        matches = []
+        # Candidates are collected as arrays; PatternMatch objects are only
+        # built for the matches that survive deduplication
+        candidates = []
 
         for window_size in self.window_sizes:
             if len(prices) < window_size:
                 continue
 
-            for pattern in patterns:
-                pattern_matches = self._find_pattern_in_window(
-                    prices, pattern, window_size
-                )
-                matches.extend(pattern_matches)
+            # Candidate windows are normalized once and shared by every pattern
+            windows = self._normalized_windows(prices, window_size)
+            for j, pattern in enumerate(patterns):
+                found = self._find_pattern_in_window(windows, pattern, window_size)
+                found["pattern"] = j
+                candidates.append(found)
+
+        if not candidates:
+            return []
+        found = np.concatenate(candidates)
 
         # Remove duplicates (keep best match per region)
-        matches = self._deduplicate_matches(matches)
+        keep = self._deduplicate_ranges(found["similarity"], found["start"], found["end"])
+
+        matches = []
+        for pattern_idx, similarity, start, end, distance in found[keep].tolist():
+            pattern = patterns[pattern_idx]
+            matches.append(
+                PatternMatch(
+                    pattern_type=pattern.pattern_type,
+                    similarity=similarity,
+                    start_idx=start,
+                    end_idx=end,
+                    dtw_distance=distance,
+                    description=pattern.description,
+                    expected_outcome=pattern.expected_outcome,
+                )
+            )
 
         return matches
 
+    def _normalized_windows(self, prices: NDArray[Any], window_size: int) -> NDArray[Any]:
+        """Normalize every candidate window of the sliding search at once.
+
+        Args:
+            prices: Price sequence to search
+            window_size: Window length
+
+        Returns:
+            Array of shape (num_windows, window_size); row ``k`` is
+            ``normalize_sequence`` of the window starting at ``k * stride``
+        """
+        stride = max(1, window_size // 4)
+        windows = np.lib.stride_tricks.sliding_window_view(prices, window_size)[::stride]
+
+        min_vals = windows.min(axis=1, keepdims=True)
+        spans = windows.max(axis=1, keepdims=True) - min_vals
+        flat = spans < 1e-10
+        dtype = np.float32 if self.precision == "fp32" else np.result_type(windows, 1.0)
+        normalized: NDArray[Any] = np.subtract(windows, min_vals, dtype=dtype)
+        np.divide(normalized, spans, out=normalized, where=~flat)
+        normalized[flat[:, 0]] = 0
+        return normalized
+
     def _find_pattern_in_window(
         self,
-        prices: NDArray[Any],
+        windows: NDArray[Any],
         pattern: Pattern,
         window_size: int,
-    ) -> list[PatternMatch]:
-        """Find pattern using sliding window."""
-        matches = []
-        template = pattern.template
+    ) -> NDArray[Any]:
+        """Find pattern using sliding window.
+
+        Args:
+            windows: Normalized candidate windows from ``_normalized_windows``
+            pattern: Pattern to search for
+            window_size: Window length
 
+        Returns:
+            ``_MATCH_DTYPE`` array of windows meeting the similarity threshold,
+            with the "pattern" field left for the caller to fill in
+        """
         # Resample template to match window size
-        resampled = np.interp(
-            np.linspace(0, 1, window_size),
-            np.linspace(0, 1, len(template)),
-            template,
-        )
+        resampled = self.library.resampled_template(pattern, window_size)
+        if self.precision == "fp32":
+            resampled = resampled.astype(np.float32)
 
         stride = max(1, window_size // 4)
-
-        for i in range(0, len(prices) - window_size + 1, stride):
-            window = prices[i : i + window_size]
-            normalized = self.normalize_sequence(window)
-
-            # Compute DTW distance
-            distance = self.dtw_distance(normalized, resampled, window=window_size // 4)
-
-            # Convert distance to similarity (0-1)
-            max_distance = window_size * 2  # Rough upper bound
-            similarity = max(0, 1 - distance / max_distance)
-
-            if similarity >= self.similarity_threshold:
-                matches.append(
-                    PatternMatch(
-                        pattern_type=pattern.pattern_type,
-                        similarity=similarity,
-                        start_idx=i,
-                        end_idx=i + window_size,
-                        dtw_distance=distance,
-                        description=pattern.description,
-                        expected_outcome=pattern.expected_outcome,
-                    )
-                )
-
-        return matches
+        band = int(window_size * self.warping_band_ratio)
+        max_distance = window_size * 2  # Rough upper bound
+
+        # Largest distance that still meets the threshold; DTW abandons past it
+        cutoff = np.inf
+        if self.similarity_threshold > 0:
+            cutoff = (1 - self.similarity_threshold) * max_distance
+            cutoff += 1e-9 * max(1.0, cutoff)  # Tolerance for summation order
+
+        # LB_Keogh <= DTW, so a window whose bound already exceeds the cutoff
+        # can skip the DTW computation
+        candidates = np.arange(len(windows))
+        if self.lb_prefilter and self.similarity_threshold > 0:
+            upper, lower = _keogh_envelope(resampled, band or window_size)
+            excess = np.maximum(windows - upper, 0) + np.maximum(lower - windows, 0)
+            # Summed in float64 like DTW, so float32 input cannot round LB above it
+            candidates = np.flatnonzero(excess.sum(axis=1, dtype=np.float64) <= cutoff)
+
+        # Compute DTW distances for all candidates in one (parallel) kernel call
+        distances = dtw_batch(windows, resampled, candidates, band if band else -1, cutoff)
+
+        # Convert distance to similarity (0-1)
+        similarities = np.maximum(0, 1 - distances / max_distance)
+        keep = similarities >= self.similarity_threshold
+
+        found = np.empty(np.count_nonzero(keep), dtype=_MATCH_DTYPE)
+        found["similarity"] = similarities[keep]
+        found["start"] = candidates[keep] * stride
+        found["end"] = found["start"] + window_size
+        found["distance"] = distances[keep]
+        return found
 
     def _deduplicate_matches(self, matches: list[PatternMatch]) -> list[PatternMatch]:
         """Remove overlapping matches, keeping best ones."""
         if not matches:
             return []
 
-        # Sort by similarity (descending)
-        matches = sorted(matches, key=lambda m: m.similarity, reverse=True)
+        keep = self._deduplicate_ranges(
+            np.array([m.similarity for m in matches]),
+            np.array([m.start_idx for m in matches]),
+            np.array([m.end_idx for m in matches]),
+        )
+        return [matches[k] for k in keep]
+
+    def _deduplicate_ranges(
+        self,
+        similarities: NDArray[Any],
+        starts: NDArray[Any],
+        ends: NDArray[Any],
+    ) -> list[int]:
+        """Pick non-overlapping ranges, best similarity first.
+
+        A range is dropped when more than half of it overlaps a range that
+        was already kept.
 
-        deduplicated = []
+        Args:
+            similarities: Similarity of each range
+            starts: Start index of each range
+            ends: End index (exclusive) of each range
+
+        Returns:
+            Indices of the kept ranges, by descending similarity
+        """
+        if len(similarities) == 0:
+            return []
+
+        # Sort by similarity (descending); stable, so ties keep search order
+        order = np.argsort(-similarities, kind="stable").tolist()
+        start_list = starts.tolist()
+        end_list = ends.tolist()
+
+        kept = []
+        # Accepted ranges kept sorted by start. No range is longer than
+        # max_len, so only those starting in [start - max_len, end) can overlap
         used_ranges: list[tuple[int, int]] = []
+        max_len = int((ends - starts).max())
 
-        for match in matches:
+        for k in order:
+            match_start = start_list[k]
+            match_end = end_list[k]
             # Check if this range overlaps with any used range
             overlaps = False
-            for start, end in used_ranges:
-                if not (match.end_idx <= start or match.start_idx >= end):
-                    overlap_pct = (
-                        min(match.end_idx, end) - max(match.start_idx, start)
-                    ) / (match.end_idx - match.start_idx)
+            lo = bisect.bisect_left(used_ranges, (match_start - max_len,))
+            hi = bisect.bisect_left(used_ranges, (match_end,))
+            for start, end in used_ranges[lo:hi]:
+                if not (match_end <= start or match_start >= end):
+                    overlap_pct = (min(match_end, end) - max(match_start, start)) / (
+                        match_end - match_start
+                    )
                     if overlap_pct > 0.5:
                         overlaps = True
                         break
 
             if not overlaps:
-                deduplicated.append(match)
-                used_ranges.append((match.start_idx, match.end_idx))
+                kept.append(k)
+                bisect.insort(used_ranges, (match_start, match_end))
 
-        return deduplicated
+        return kept
 
     def match_single_pattern(
         self,
@@ -1,33 +1,69 @@
 """Base scraper class with common functionality."""
 
 import asyncio
+import os
 import random
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Self
+from urllib.parse import urlsplit
 
 import httpx
+import orjson
 from loguru import logger
 
+from .cache import ResponseCache
 from .database import DatabaseClient
 
 
+def decode_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body with orjson.
+
+    Decodes the raw bytes directly, skipping httpx's charset detection.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Parsed JSON value
+    """
+    return orjson.loads(response.content)
+
+
+# Per-host request budgets (requests per minute) for hosts that tolerate more
+# traffic than the default ``ScraperConfig.requests_per_minute``.
+HOST_REQUESTS_PER_MINUTE: dict[str, int] = {
+    "query1.finance.yahoo.com": 100,
+    "query2.finance.yahoo.com": 100,
+}
+
+
 @dataclass
 class ScraperConfig:
     """Configuration for scrapers."""
 
-    # Rate limiting
+    # Rate limiting (per host)
     requests_per_minute: int = 30
+    host_requests_per_minute: dict[str, int] = field(
+        default_factory=lambda: dict(HOST_REQUESTS_PER_MINUTE)
+    )
     min_delay: float = 1.0
     max_delay: float = 3.0
 
+    # Maximum symbols scraped concurrently (scrapers that fan out)
+    max_concurrency: int = 10
+
     # Retry settings
     max_retries: int = 3
     retry_delay: float = 5.0
 
     # HTTP settings
     timeout: float = 30.0
+    http2: bool = True
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 30.0
     user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -36,6 +72,49 @@ class ScraperConfig:
     # Extra headers
     extra_headers: dict[str, str] = field(default_factory=dict)
 
+    # Response cache for GET requests (disabled when no directory is set)
+    cache_dir: str | None = field(
+        default_factory=lambda: os.environ.get("JEJAKCUAN_SCRAPER_CACHE_DIR")
+    )
+    cache_ttl: float = 6 * 3600
+
+
+class HostRateLimiter:
+    """Request spacing for a single host.
+
+    Each call to ``acquire`` reserves the next free slot for the host, so
+    concurrent tasks hitting the same host are spaced ``60 / requests_per_minute``
+    seconds apart while requests to other hosts are not delayed.
+    """
+
+    def __init__(self, requests_per_minute: int) -> None:
+        """Initialize limiter.
+
+        Args:
+            requests_per_minute: Allowed request rate for the host
+        """
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot: float = 0.0
+
+    def delay(self) -> float:
+        """Reserve the next slot.
+
+        Returns:
+            Seconds to wait before the request may be sent
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        return slot - now
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back all further requests to the host.
+
+        Args:
+            seconds: Seconds from now before the next request is allowed
+        """
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
 
 class BaseScraper(ABC):
     """Base class for all scrapers."""
@@ -53,9 +132,15 @@ class BaseScraper(ABC):
         """
         self.config = config or ScraperConfig()
         self.db = db_client or DatabaseClient()
-        self._last_request_time: float = 0
+        self._limiters: dict[str, HostRateLimiter] = {}
         self._request_count: int = 0
         self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Future[httpx.Response | None]] = {}
+        self._cache = (
+            ResponseCache(self.config.cache_dir, self.config.cache_ttl)
+            if self.config.cache_dir
+            else None
+        )
 
     def _build_headers(self) -> dict[str, str]:
         """Build HTTP request headers.
@@ -76,6 +161,9 @@ class BaseScraper(ABC):
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client.
 
+        The client is created once and reused for the scraper's lifetime so
+        that connections (and their TLS handshakes) are pooled across requests.
+
         Returns:
             Async HTTP client
         """
@@ -84,6 +172,12 @@ class BaseScraper(ABC):
                 timeout=self.config.timeout,
                 headers=self._build_headers(),
                 follow_redirects=True,
+                http2=self.config.http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
             )
         return self._client
 
@@ -91,25 +185,73 @@ class BaseScraper(ABC):
         """Close HTTP client and database connection."""
         if self._client and not self._client.is_closed:
             await self._client.aclose()
+        self._client = None
         self.db.close()
 
-    async def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        now = time.time()
-        elapsed = now - self._last_request_time
+    async def __aenter__(self) -> Self:
+        """Open the pooled HTTP client for the duration of a run."""
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the pooled HTTP client and database connection."""
+        await self.close()
 
-        # Calculate required delay
-        min_interval = 60.0 / self.config.requests_per_minute
-        if elapsed < min_interval:
-            await asyncio.sleep(min_interval - elapsed)
+    def _limiter(self, url: str | None) -> HostRateLimiter:
+        """Get or create the rate limiter for a URL's host.
+
+        Args:
+            url: Request URL (None shares a single anonymous limiter)
+
+        Returns:
+            Rate limiter for the host
+        """
+        host = urlsplit(url).netloc if url else ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            rpm = self.config.host_requests_per_minute.get(host, self.config.requests_per_minute)
+            limiter = self._limiters[host] = HostRateLimiter(rpm)
+        return limiter
+
+    async def _rate_limit(self, url: str | None = None) -> None:
+        """Apply per-host rate limiting before a request.
+
+        Args:
+            url: URL about to be requested
+        """
+        wait = self._limiter(url).delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
 
         # Add random jitter
         jitter = random.uniform(self.config.min_delay, self.config.max_delay)
         await asyncio.sleep(jitter)
 
-        self._last_request_time = time.time()
         self._request_count += 1
 
+    def _update_rate_limit(self, url: str, response: httpx.Response) -> None:
+        """Tighten a host's limiter from rate-limit response headers.
+
+        Honors ``Retry-After`` and an exhausted ``X-RateLimit-Remaining``
+        together with ``X-RateLimit-Reset`` (delta seconds or epoch).
+
+        Args:
+            url: Requested URL
+            response: Response from the host
+        """
+        headers = response.headers
+        wait: float | None = None
+        try:
+            if "Retry-After" in headers:
+                wait = float(headers["Retry-After"])
+            elif headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+                reset = float(headers["X-RateLimit-Reset"])
+                wait = reset - time.time() if reset > 1e9 else reset
+        except ValueError:
+            return
+        if wait and wait > 0:
+            self._limiter(url).block_for(wait)
+
     async def _fetch_url(
         self,
         url: str,
@@ -118,6 +260,48 @@ class BaseScraper(ABC):
     ) -> httpx.Response | None:
         """Fetch URL with rate limiting and retry logic.
 
+        Identical requests issued while one is already in flight share its
+        result instead of hitting the network again.
+
+        Args:
+            url: URL to fetch
+            method: HTTP method
+            **kwargs: Additional request arguments
+
+        Returns:
+            Response or None on failure
+        """
+        # Only coalesce requests fully described by method, URL and params
+        if not kwargs.keys() <= {"params"}:
+            return await self._request_with_retry(url, method, **kwargs)
+
+        # params may be a dict, a sequence of pairs or QueryParams
+        params = sorted(httpx.QueryParams(kwargs.get("params")).multi_items())
+        key = f"{method}:{url}:{params}"
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[httpx.Response | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._request_with_retry(url, method, **kwargs)
+            future.set_result(response)
+            return response
+        finally:
+            if not future.done():
+                # Leader failed or was cancelled; waiters see a failed fetch
+                future.set_result(None)
+            self._inflight.pop(key, None)
+
+    async def _request_with_retry(
+        self,
+        url: str,
+        method: str,
+        **kwargs: Any,
+    ) -> httpx.Response | None:
+        """Perform a request through the cache, rate limiter and retry loop.
+
         Args:
             url: URL to fetch
             method: HTTP method
@@ -126,22 +310,34 @@ class BaseScraper(ABC):
         Returns:
             Response or None on failure
         """
+        cache_key: str | None = None
+        if self._cache is not None and method == "GET":
+            cache_key = self._cache.make_key(method, url, kwargs.get("params"))
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Cache hit: {url}")
+                return cached
+
         client = await self._get_client()
 
         for attempt in range(self.config.max_retries):
             try:
-                await self._rate_limit()
+                await self._rate_limit(url)
 
                 logger.debug(f"Fetching: {url} (attempt {attempt + 1})")
                 response = await client.request(method, url, **kwargs)
+                self._update_rate_limit(url, response)
                 response.raise_for_status()
 
+                if cache_key is not None and self._cache is not None:
+                    await self._cache.set(cache_key, response)
                 return response
 
             except httpx.HTTPStatusError as e:
                 logger.warning(f"HTTP error {e.response.status_code} for {url}")
                 if e.response.status_code == 429:  # Rate limited
-                    await asyncio.sleep(self.config.retry_delay * (attempt + 1))
+                    # Exponential backoff, applied to every request for this host
+                    self._limiter(url).block_for(self.config.retry_delay * 2**attempt)
                 elif e.response.status_code >= 500:  # Server error
                     await asyncio.sleep(self.config.retry_delay)
                 else:
@@ -168,7 +364,7 @@ class BaseScraper(ABC):
         if response is None:
             return None
         try:
-            result: dict[str, Any] = response.json()
+            result: dict[str, Any] = decode_json(response)
             return result
         except Exception as e:
             logger.error(f"Failed to parse JSON from {url}: {e}")
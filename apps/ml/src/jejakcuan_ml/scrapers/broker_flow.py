@@ -337,7 +337,7 @@ class BrokerFlowScraper(BaseScraper):
 
             client = await self._get_client()
             try:
-                await self._rate_limit()
+                await self._rate_limit(url)
                 response = await client.get(url, headers=headers, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -383,7 +383,7 @@ class BrokerFlowScraper(BaseScraper):
 
         client = await self._get_client()
         try:
-            await self._rate_limit()
+            await self._rate_limit(url)
             response = await client.get(url, params=params, headers=headers)
             if response.status_code == 200:
                 data = response.json()
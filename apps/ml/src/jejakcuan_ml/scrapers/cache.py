@@ -0,0 +1,119 @@
+"""On-disk HTTP response cache for scrapers.
+
+Market data sources change at most once per trading day, so a same-day re-run
+can be served from disk instead of the network. Each response is stored as a
+single file named after a hash of the request: one orjson metadata line
+followed by the raw body.
+"""
+
+import contextlib
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+import aiofiles.os
+import httpx
+import orjson
+from loguru import logger
+
+
+class ResponseCache:
+    """TTL-based directory cache for HTTP responses."""
+
+    def __init__(self, directory: str | Path, ttl: float) -> None:
+        """Initialize cache.
+
+        Args:
+            directory: Directory holding cached responses (created if missing)
+            ttl: Seconds a cached response stays valid
+        """
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Any = None) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        raw = repr((method.upper(), url, params)).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    async def get(self, key: str) -> httpx.Response | None:
+        """Load a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response, or None when missing, expired or unreadable
+        """
+        path = self._path(key)
+        try:
+            stat = await aiofiles.os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl:
+                return None
+            async with aiofiles.open(path, "rb") as f:
+                data = await f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry {path.name}: {e}")
+            return None
+
+        try:
+            header, _, body = data.partition(b"\n")
+            meta = orjson.loads(header)
+            return httpx.Response(
+                meta["status"],
+                headers=meta["headers"],
+                content=body,
+                request=httpx.Request(meta["method"], meta["url"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.debug(f"Discarding corrupt cache entry {path.name}")
+            return None
+
+    async def set(self, key: str, response: httpx.Response) -> None:
+        """Store a response.
+
+        Failures are logged and ignored; the cache is only an optimization.
+
+        Args:
+            key: Cache key
+            response: Response to store
+        """
+        meta = {
+            "method": response.request.method,
+            "url": str(response.request.url),
+            "status": response.status_code,
+            "headers": {"content-type": response.headers.get("content-type", "")},
+        }
+        path = self._path(key)
+        # Unique per write: concurrent stores of one key must not share a file
+        tmp = path.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp, "wb") as f:
+                await f.write(orjson.dumps(meta) + b"\n" + response.content)
+            # Atomic rename so concurrent readers never see a partial file
+            await aiofiles.os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path.name}: {e}")
+            with contextlib.suppress(OSError):
+                await aiofiles.os.remove(tmp)
@@ -89,8 +89,8 @@ async def run_scraper(name: str, symbols: list[str] | None, days: int) -> int:
 
 async def sync_stocks(sharia_only: bool = False) -> int:
     """Sync stock list from IDX API to database."""
-    scraper = IDXScraper()
-    return await scraper.sync_stocks_to_db(sharia_only=sharia_only)
+    async with IDXScraper() as scraper:
+        return await scraper.sync_stocks_to_db(sharia_only=sharia_only)
 
 
 async def run_all_scrapers(symbols: list[str] | None, days: int) -> int:
@@ -190,14 +190,16 @@ class DatabaseClient:
             return 0
 
         with self.cursor() as cur:
-            # Use execute_values for efficient batch insert
-            psycopg2.extras.execute_values(
+            # Use execute_values for efficient batch insert. cur.rowcount only
+            # covers the last page, so count the returned rows instead
+            inserted = psycopg2.extras.execute_values(
                 cur,
                 """
                 INSERT INTO stock_prices (
                     time, symbol, open, high, low, close, volume, value, frequency
                 ) VALUES %s
                 ON CONFLICT DO NOTHING
+                RETURNING 1
                 """,
                 [
                     (
@@ -213,8 +215,50 @@ class DatabaseClient:
                     )
                     for p in prices
                 ],
+                page_size=1000,
+                fetch=True,
             )
-            return cur.rowcount
+            return len(inserted)
+
+    def insert_news_batch(self, items: list[dict[str, Any]]) -> int:
+        """Insert multiple news items efficiently.
+
+        Args:
+            items: List of news dictionaries
+
+        Returns:
+            Number of records inserted
+        """
+        if not items:
+            return 0
+
+        with self.cursor() as cur:
+            # cur.rowcount only covers the last page; count the returned rows
+            inserted = psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO stock_news (
+                    symbol, title, summary, source, url, published_at, keywords
+                ) VALUES %s
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+                """,
+                [
+                    (
+                        n["symbol"],
+                        n["title"],
+                        n.get("summary"),
+                        n["source"],
+                        n["url"],
+                        n["published_at"],
+                        n.get("keywords"),
+                    )
+                    for n in items
+                ],
+                page_size=500,
+                fetch=True,
+            )
+            return len(inserted)
 
     def insert_broker_summary(
         self,
@@ -358,6 +402,23 @@ class DatabaseClient:
                 return result["earliest"]  # type: ignore[no-any-return]
             return None
 
+    def get_price_date_bounds(self) -> dict[str, tuple[date, date]]:
+        """Get the earliest and latest price date of every symbol.
+
+        Returns:
+            Mapping of symbol to (earliest, latest) price date; symbols without
+            prices are absent
+        """
+        with self.cursor() as cur:
+            cur.execute(
+                """
+                SELECT symbol, MIN(time)::date AS earliest, MAX(time)::date AS latest
+                FROM stock_prices
+                GROUP BY symbol
+                """
+            )
+            return {row["symbol"]: (row["earliest"], row["latest"]) for row in cur.fetchall()}
+
     def get_stock_count(self) -> int:
         """Get total number of stocks.
 
@@ -11,20 +11,53 @@ References:
 """
 
 import asyncio
+import math
+import operator
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
-from decimal import Decimal
-from typing import Any
+from decimal import Decimal, InvalidOperation
+from typing import Any, cast
 
-from bs4 import BeautifulSoup
+import httpx
+import ijson
+import lxml.html
 from loguru import logger
+from lxml.cssselect import CSSSelector
 
-from .base import BaseScraper, ScraperConfig
+from .base import BaseScraper, ScraperConfig, decode_json
 from .database import DatabaseClient
 
+_SYMBOL_RE = re.compile(r"^[A-Z]{4}$")
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d", "%d-%m-%Y")
 
-@dataclass
+# CSS selectors compiled once to XPath and reused for every page
+_ISSI_LINK_SEL = CSSSelector("a[href*='/en/company/']")
+_COMPANY_NAME_SEL = CSSSelector("h1, .company-name")
+
+# Bodies smaller than this are decoded in one go; larger ones are streamed
+_STREAM_MIN_BYTES = 64 * 1024
+
+
+def _iter_results(response: httpx.Response) -> Iterator[Any]:
+    """Iterate the ``Results`` array of an IDX API response.
+
+    Large bodies are parsed incrementally with ijson so the full result list
+    is never materialized; small ones use orjson, which is cheaper to set up.
+
+    Args:
+        response: IDX API response
+
+    Returns:
+        Iterator over result items
+    """
+    if len(response.content) < _STREAM_MIN_BYTES:
+        return iter(decode_json(response).get("Results", []))
+    return cast(Iterator[Any], ijson.items(response.content, "Results.item"))
+
+
+@dataclass(slots=True)
 class FinancialData:
     """Financial data for a stock."""
 
@@ -48,15 +81,35 @@ class FinancialData:
     eps: Decimal | None = None
     book_value_per_share: Decimal | None = None
 
-    # Ratios
-    pe_ratio: Decimal | None = None
-    pb_ratio: Decimal | None = None
-    ev_ebitda: Decimal | None = None
-    roe: Decimal | None = None
-    roa: Decimal | None = None
-
-
-@dataclass
+    # Ratios (plain floats; money fields above stay Decimal)
+    pe_ratio: float | None = None
+    pb_ratio: float | None = None
+    ev_ebitda: float | None = None
+    roe: float | None = None
+    roa: float | None = None
+
+
+# Fields persisted by IDXScraper._save_financials
+_FIN_FIELDS = (
+    "revenue",
+    "net_income",
+    "ebitda",
+    "total_assets",
+    "total_equity",
+    "total_debt",
+    "free_cash_flow",
+    "eps",
+    "book_value_per_share",
+    "pe_ratio",
+    "pb_ratio",
+    "ev_ebitda",
+    "roe",
+    "roa",
+)
+_FIN_GETTER = operator.attrgetter(*_FIN_FIELDS)
+
+
+@dataclass(slots=True)
 class StockInfo:
     """Basic stock information from IDX."""
 
@@ -69,11 +122,50 @@ class StockInfo:
     shares_outstanding: int | None = None
 
 
+def _parse_issi_html(content: bytes) -> list[str]:
+    """Extract stock codes from the ISSI index page.
+
+    Called through ``asyncio.to_thread``; lxml releases the GIL while parsing.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        Stock symbols found on the page
+    """
+    tree = lxml.html.fromstring(content)
+    symbols: list[str] = []
+    # Look for stock codes in the page
+    for link in _ISSI_LINK_SEL(tree):
+        symbol = link.text_content().strip()
+        if _SYMBOL_RE.match(symbol):
+            symbols.append(symbol)
+    return symbols
+
+
+def _parse_company_name(content: bytes) -> str | None:
+    """Extract the company name from an IDX company page.
+
+    Called through ``asyncio.to_thread``; lxml releases the GIL while parsing.
+
+    Args:
+        content: Raw HTML
+
+    Returns:
+        Company name or None
+    """
+    tree = lxml.html.fromstring(content)
+    names = _COMPANY_NAME_SEL(tree)
+    return names[0].text_content().strip() if names else None
+
+
 class IDXScraper(BaseScraper):
     """Scraper for IDX fundamental data."""
 
     IDX_BASE = "https://www.idx.co.id"
     STOCKBIT_API = "https://api.stockbit.com"
+    REPORT_PROBE_CONCURRENCY = 8
+    PROGRESS_LOG_INTERVAL = 50
 
     def __init__(
         self,
@@ -91,6 +183,15 @@ class IDXScraper(BaseScraper):
         super().__init__(config, db_client)
         self._symbols = symbols
 
+        # Caps concurrent HEAD probes against idx.co.id
+        self._report_probe_sem = asyncio.BoundedSemaphore(self.REPORT_PROBE_CONCURRENCY)
+
+        # Computed once so every row in a run shares the same period
+        self._today = date.today()
+        self._current_quarter_start = date(
+            self._today.year, ((self._today.month - 1) // 3) * 3 + 1, 1
+        )
+
     def get_name(self) -> str:
         """Get scraper name."""
         return "IDX Fundamental"
@@ -116,8 +217,11 @@ class IDXScraper(BaseScraper):
         logger.info(f"Scraping fundamentals for {len(symbols)} stocks")
 
         # Scrape each stock
+        total = len(symbols)
         for i, symbol in enumerate(symbols):
-            logger.info(f"[{i + 1}/{len(symbols)}] Scraping {symbol}")
+            if i % self.PROGRESS_LOG_INTERVAL == 0:
+                logger.info(f"[{i}/{total}] progress, {count} records so far")
+            logger.debug(f"[{i + 1}/{total}] Scraping {symbol}")
             try:
                 # Get stock info and financial data
                 info = await self._fetch_stock_info(symbol)
@@ -157,8 +261,7 @@ class IDXScraper(BaseScraper):
         response = await self._fetch_url(url, params=params)
         if response:
             try:
-                data = response.json()
-                for item in data.get("Results", []):
+                for item in _iter_results(response):
                     symbol = item.get("Code", "")
                     if symbol:
                         symbols.append(symbol)
@@ -170,12 +273,7 @@ class IDXScraper(BaseScraper):
             url = f"{self.IDX_BASE}/en/data/stock-index/ISSI"
             response = await self._fetch_url(url)
             if response:
-                soup = BeautifulSoup(response.text, "html.parser")
-                # Look for stock codes in the page
-                for link in soup.select("a[href*='/en/company/']"):
-                    symbol = link.get_text(strip=True)
-                    if re.match(r"^[A-Z]{4}$", symbol):
-                        symbols.append(symbol)
+                symbols = await asyncio.to_thread(_parse_issi_html, response.content)
 
         # Fallback: Known major Syariah stocks
         if not symbols:
@@ -261,7 +359,7 @@ class IDXScraper(BaseScraper):
                 break
 
             try:
-                data = response.json()
+                data = decode_json(response)
                 results = data.get("Results", [])
                 if not results:
                     break
@@ -501,7 +599,7 @@ class IDXScraper(BaseScraper):
         response = await self._fetch_url(url, params=params)
         if response:
             try:
-                data = response.json()
+                data = decode_json(response)
                 return StockInfo(
                     symbol=symbol,
                     name=data.get("Name", symbol),
@@ -517,10 +615,9 @@ class IDXScraper(BaseScraper):
         url = f"{self.IDX_BASE}/en/company/{symbol}"
         response = await self._fetch_url(url)
         if response:
-            soup = BeautifulSoup(response.text, "html.parser")
-            name = soup.select_one("h1, .company-name")
+            name = await asyncio.to_thread(_parse_company_name, response.content)
             if name:
-                return StockInfo(symbol=symbol, name=name.get_text(strip=True))
+                return StockInfo(symbol=symbol, name=name)
 
         return None
 
@@ -542,8 +639,7 @@ class IDXScraper(BaseScraper):
         response = await self._fetch_url(url, params=params)
         if response:
             try:
-                data = response.json()
-                for item in data.get("Results", []):
+                for item in _iter_results(response):
                     fin = self._parse_financial_statement(symbol, item)
                     if fin:
                         financials.append(fin)
@@ -568,22 +664,42 @@ class IDXScraper(BaseScraper):
             Financial data or None
         """
         # Try IDX financial report page
-        year = datetime.now().year
+        year = self._today.year
         quarters = ["Q4", "Q3", "Q2", "Q1"]
 
-        for q in quarters:
-            path = f"/StaticData/NewsAndAnnouncement/INDEXANNOUNCEMENT/{symbol}_{year}_{q}.pdf"
-            url = f"{self.IDX_BASE}{path}"
-            response = await self._fetch_url(url, method="HEAD")
-            if response and response.status_code == 200:
-                logger.info(f"Found financial report: {symbol} {year} {q}")
-                # We would need PDF parsing here
-                break
+        # Probe all quarters at once, then take the most recent one that exists
+        found = await asyncio.gather(
+            *(self._probe_report(f"{symbol}_{year}_{q}.pdf", q) for q in quarters)
+        )
+        latest = next((q for q in found if q), None)
+        if latest:
+            logger.info(f"Found financial report: {symbol} {year} {latest}")
+            # We would need PDF parsing here
+
+        return None
+
+    async def _probe_report(self, filename: str, quarter: str) -> str | None:
+        """Check whether a financial report PDF exists on IDX.
 
+        Args:
+            filename: Report file name
+            quarter: Quarter label returned on success
+
+        Returns:
+            The quarter label if the report exists, otherwise None
+        """
+        url = f"{self.IDX_BASE}/StaticData/NewsAndAnnouncement/INDEXANNOUNCEMENT/{filename}"
+        async with self._report_probe_sem:
+            response = await self._fetch_url(url, method="HEAD")
+        if response and response.status_code == 200:
+            return quarter
         return None
 
     async def _fetch_statistics(self, symbol: str) -> FinancialData | None:
-        """Fetch key statistics from StockBit API.
+        """Fetch key statistics, preferring StockBit over Yahoo Finance.
+
+        Both sources are queried concurrently; the Yahoo request is cancelled
+        as soon as StockBit returns usable data.
 
         Args:
             symbol: Stock symbol
@@ -591,6 +707,27 @@ class IDXScraper(BaseScraper):
         Returns:
             Financial data with ratios
         """
+        stockbit_task = asyncio.create_task(self._fetch_stockbit_stats(symbol))
+        yahoo_task = asyncio.create_task(self._fetch_yfinance_stats(symbol))
+        try:
+            stats = await stockbit_task
+            if stats is not None:
+                return stats
+            # Alternative: Yahoo Finance for basic ratios
+            return await yahoo_task
+        finally:
+            stockbit_task.cancel()
+            yahoo_task.cancel()
+
+    async def _fetch_stockbit_stats(self, symbol: str) -> FinancialData | None:
+        """Fetch key statistics from StockBit API.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Financial data with ratios or None
+        """
         # StockBit fundamental API
         url = f"{self.STOCKBIT_API}/v1/companies/{symbol}/fundamental"
 
@@ -602,16 +739,15 @@ class IDXScraper(BaseScraper):
 
         client = await self._get_client()
         try:
-            await self._rate_limit()
+            await self._rate_limit(url)
             response = await client.get(url, headers=headers)
             if response.status_code == 200:
-                data = response.json()
+                data = decode_json(response)
                 return self._parse_stockbit_fundamental(symbol, data)
         except Exception as e:
             logger.debug(f"Failed to fetch StockBit data for {symbol}: {e}")
 
-        # Alternative: Try Yahoo Finance for basic ratios
-        return await self._fetch_yfinance_stats(symbol)
+        return None
 
     async def _fetch_yfinance_stats(self, symbol: str) -> FinancialData | None:
         """Fetch statistics from Yahoo Finance.
@@ -634,10 +770,10 @@ class IDXScraper(BaseScraper):
 
         client = await self._get_client()
         try:
-            await self._rate_limit()
+            await self._rate_limit(url)
             response = await client.get(url, params=params)
             if response.status_code == 200:
-                data = response.json()
+                data = decode_json(response)
                 result = data.get("quoteSummary", {}).get("result", [])
                 if result:
                     return self._parse_yfinance_stats(symbol, result[0])
@@ -689,18 +825,14 @@ class IDXScraper(BaseScraper):
         if not fund_data:
             return None
 
-        # Use latest quarter
-        today = date.today()
-        quarter_end = date(today.year, ((today.month - 1) // 3) * 3 + 1, 1)
-
         return FinancialData(
             symbol=symbol,
-            period_end=quarter_end,
-            pe_ratio=self._to_decimal(fund_data.get("pe")),
-            pb_ratio=self._to_decimal(fund_data.get("pbv")),
-            ev_ebitda=self._to_decimal(fund_data.get("ev_ebitda")),
-            roe=self._to_decimal(fund_data.get("roe")),
-            roa=self._to_decimal(fund_data.get("roa")),
+            period_end=self._current_quarter_start,
+            pe_ratio=self._to_float(fund_data.get("pe")),
+            pb_ratio=self._to_float(fund_data.get("pbv")),
+            ev_ebitda=self._to_float(fund_data.get("ev_ebitda")),
+            roe=self._to_float(fund_data.get("roe")),
+            roa=self._to_float(fund_data.get("roa")),
             eps=self._to_decimal(fund_data.get("eps")),
         )
 
@@ -718,38 +850,46 @@ class IDXScraper(BaseScraper):
         fin_data = data.get("financialData", {})
         summary = data.get("summaryDetail", {})
 
-        today = date.today()
-        quarter_end = date(today.year, ((today.month - 1) // 3) * 3 + 1, 1)
-
         return FinancialData(
             symbol=symbol,
-            period_end=quarter_end,
-            pe_ratio=self._to_decimal(self._get_raw(summary, "trailingPE")),
-            pb_ratio=self._to_decimal(self._get_raw(key_stats, "priceToBook")),
-            ev_ebitda=self._to_decimal(self._get_raw(key_stats, "enterpriseToEbitda")),
-            roe=self._to_decimal(self._get_raw(fin_data, "returnOnEquity")),
-            roa=self._to_decimal(self._get_raw(fin_data, "returnOnAssets")),
-            eps=self._to_decimal(self._get_raw(key_stats, "trailingEps")),
-            revenue=self._to_decimal(self._get_raw(fin_data, "totalRevenue")),
-            ebitda=self._to_decimal(self._get_raw(fin_data, "ebitda")),
-            total_debt=self._to_decimal(self._get_raw(fin_data, "totalDebt")),
-            free_cash_flow=self._to_decimal(self._get_raw(fin_data, "freeCashflow")),
+            period_end=self._current_quarter_start,
+            pe_ratio=self._raw_float(summary, "trailingPE"),
+            pb_ratio=self._raw_float(key_stats, "priceToBook"),
+            ev_ebitda=self._raw_float(key_stats, "enterpriseToEbitda"),
+            roe=self._raw_float(fin_data, "returnOnEquity"),
+            roa=self._raw_float(fin_data, "returnOnAssets"),
+            eps=self._raw_decimal(key_stats, "trailingEps"),
+            revenue=self._raw_decimal(fin_data, "totalRevenue"),
+            ebitda=self._raw_decimal(fin_data, "ebitda"),
+            total_debt=self._raw_decimal(fin_data, "totalDebt"),
+            free_cash_flow=self._raw_decimal(fin_data, "freeCashflow"),
         )
 
-    def _get_raw(self, data: dict[str, Any], key: str) -> Any:
-        """Get raw value from Yahoo Finance nested structure.
+    def _raw_decimal(self, data: dict[str, Any], key: str) -> Decimal | None:
+        """Get a Yahoo Finance ``{"raw": ...}`` value as Decimal.
+
+        Args:
+            data: Data dictionary
+            key: Key to look for
+
+        Returns:
+            Decimal or None
+        """
+        item = data.get(key)
+        return self._to_decimal(item.get("raw") if isinstance(item, dict) else item)
+
+    def _raw_float(self, data: dict[str, Any], key: str) -> float | None:
+        """Get a Yahoo Finance ``{"raw": ...}`` value as float.
 
         Args:
             data: Data dictionary
             key: Key to look for
 
         Returns:
-            Raw value or None
+            Float or None
         """
-        item = data.get(key, {})
-        if isinstance(item, dict):
-            return item.get("raw")
-        return item
+        item = data.get(key)
+        return self._to_float(item.get("raw") if isinstance(item, dict) else item)
 
     def _parse_date(self, text: Any) -> date | None:
         """Parse date from various formats.
@@ -765,11 +905,15 @@ class IDXScraper(BaseScraper):
 
         if isinstance(text, int):
             # Unix timestamp
-            return datetime.fromtimestamp(text / 1000).date()
+            return date.fromtimestamp(text / 1000)
 
         if isinstance(text, str):
-            formats = ["%Y-%m-%d", "%d/%m/%Y", "%Y%m%d", "%d-%m-%Y"]
-            for fmt in formats:
+            # Fast path for ISO dates, parsed in C
+            try:
+                return date.fromisoformat(text)
+            except ValueError:
+                pass
+            for fmt in _DATE_FORMATS:
                 try:
                     return datetime.strptime(text, fmt).date()
                 except ValueError:
@@ -786,12 +930,40 @@ class IDXScraper(BaseScraper):
         Returns:
             Decimal or None
         """
-        if value is None:
+        if value is None or isinstance(value, bool):
             return None
-        try:
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, int):
+            return Decimal(value)
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return None
+            # str() keeps the short repr (0.1 -> "0.1") instead of the exact binary value
             return Decimal(str(value))
+        try:
+            return Decimal(value if isinstance(value, str) else str(value))
+        except (ValueError, TypeError, InvalidOperation):
+            return None
+
+    def _to_float(self, value: Any) -> float | None:
+        """Convert value to float.
+
+        Args:
+            value: Value to convert
+
+        Returns:
+            Finite float or None
+        """
+        if value is None or isinstance(value, bool):
+            return None
+        if isinstance(value, float):
+            return value if math.isfinite(value) else None
+        try:
+            result = float(value)
         except (ValueError, TypeError):
             return None
+        return result if math.isfinite(result) else None
 
     def _save_stock_info(self, info: StockInfo) -> None:
         """Save stock info to database.
@@ -815,29 +987,9 @@ class IDXScraper(BaseScraper):
             fin: Financial data to save
         """
         # Build kwargs from non-None fields
-        kwargs: dict[str, Any] = {}
-
-        fields = [
-            "revenue",
-            "net_income",
-            "ebitda",
-            "total_assets",
-            "total_equity",
-            "total_debt",
-            "free_cash_flow",
-            "eps",
-            "book_value_per_share",
-            "pe_ratio",
-            "pb_ratio",
-            "ev_ebitda",
-            "roe",
-            "roa",
-        ]
-
-        for field in fields:
-            value = getattr(fin, field)
-            if value is not None:
-                kwargs[field] = value
+        kwargs: dict[str, Any] = {
+            field: value for field, value in zip(_FIN_FIELDS, _FIN_GETTER(fin)) if value is not None
+        }
 
         if kwargs:
             self.db.upsert_financials(fin.symbol, fin.period_end, **kwargs)
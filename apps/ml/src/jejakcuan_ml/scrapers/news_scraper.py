@@ -1,18 +1,165 @@
 """News scraper for Indonesian financial news with optional browser automation."""
 
+import asyncio
+import heapq
 import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from bs4 import BeautifulSoup
+from bs4.filter import SoupStrainer
 from loguru import logger
 
 from .base import BaseScraper, ScraperConfig
 from .database import DatabaseClient
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    _HAS_SELECTOLAX = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_SELECTOLAX = False
+
+_MONTHS: dict[str, int] = {
+    "januari": 1,
+    "februari": 2,
+    "maret": 3,
+    "april": 4,
+    "mei": 5,
+    "juni": 6,
+    "juli": 7,
+    "agustus": 8,
+    "september": 9,
+    "oktober": 10,
+    "november": 11,
+    "desember": 12,
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+# Longest names first so "januari" wins over "jan"
+_INDO_DATE_RE = re.compile(
+    r"(\d{1,2})\s*(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\s*(\d{4})?"
+)
+_RELATIVE_DATE_RE = re.compile(r"hari|jam|menit")
+
+# Result-list containers on the Kontan/Bisnis search pages; the BeautifulSoup
+# fallback builds only these subtrees instead of the whole page
+_ARTICLE_CONTAINERS = SoupStrainer(
+    class_=re.compile(r"\b(?:list-news|list-berita|search-result-item)\b")
+)
+
+
+def _extract_articles(
+    html: str,
+    article_selector: str,
+    title_selector: str,
+    date_selector: str,
+    limit: int = 5,
+) -> list[tuple[str, str, str | None]]:
+    """Extract (title, href, date text) from a news search results page.
+
+    Parses with selectolax (Lexbor, C) when installed, else BeautifulSoup.
+
+    Args:
+        html: Page HTML
+        article_selector: CSS selector for article containers
+        title_selector: CSS selector for the title link inside an article
+        date_selector: CSS selector for the date inside an article
+        limit: Maximum number of articles
+
+    Returns:
+        List of (title, href, date text) tuples
+    """
+    results: list[tuple[str, str, str | None]] = []
+
+    if _HAS_SELECTOLAX:
+        tree = LexborHTMLParser(html)
+        for node in tree.css(article_selector)[:limit]:
+            title_el = node.css_first(title_selector)
+            if title_el is None:
+                continue
+            date_el = node.css_first(date_selector)
+            results.append(
+                (
+                    title_el.text(strip=True),
+                    title_el.attributes.get("href") or "",
+                    date_el.text(strip=True) if date_el is not None else None,
+                )
+            )
+        return results
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=_ARTICLE_CONTAINERS)
+    for article in soup.select(article_selector)[:limit]:
+        title_tag = article.select_one(title_selector)
+        if title_tag is None:
+            continue
+        date_tag = article.select_one(date_selector)
+        results.append(
+            (
+                title_tag.get_text(strip=True),
+                str(title_tag.get("href", "")),
+                date_tag.get_text(strip=True) if date_tag else None,
+            )
+        )
+    return results
+
+
+class _KeywordMatcher:
+    """Multi-pattern matcher mapping trigger phrases to keyword categories.
+
+    Uses a pyahocorasick automaton when available so a title is scanned once
+    for all triggers; otherwise falls back to a single compiled alternation.
+    """
+
+    def __init__(self, patterns: list[tuple[str, list[str]]]) -> None:
+        self._order = [keyword for keyword, _ in patterns]
+        trigger_map: dict[str, set[str]] = {}
+        for keyword, triggers in patterns:
+            for trigger in triggers:
+                trigger_map.setdefault(trigger.lower(), set()).add(keyword)
+        self._trigger_map = trigger_map
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for trigger, keywords in trigger_map.items():
+                self._automaton.add_word(trigger, frozenset(keywords))
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # Lookahead reports overlapping triggers, like the automaton does
+            alternation = "|".join(re.escape(t) for t in sorted(trigger_map, key=len, reverse=True))
+            self._regex = re.compile(f"(?=({alternation}))")
+
+    def match(self, text_lower: str) -> list[str]:
+        """Return matched keyword categories in pattern order."""
+        found: set[str] = set()
+        if self._automaton is not None:
+            for _, keywords in self._automaton.iter(text_lower):
+                found |= keywords
+        else:
+            for m in self._regex.finditer(text_lower):
+                found |= self._trigger_map[m.group(1)]
+        return [keyword for keyword in self._order if keyword in found]
+
 
-@dataclass
+@dataclass(slots=True)
 class NewsItem:
     """News item data."""
 
@@ -33,6 +180,8 @@ class NewsScraper(BaseScraper):
         "bisnis": "https://market.bisnis.com",
     }
 
+    BROWSER_PAGES = 4
+
     KEYWORD_PATTERNS = [
         ("acquisition", ["akuisisi", "acquire", "acquisition"]),
         ("dividend", ["dividen", "dividend"]),
@@ -52,6 +201,16 @@ class NewsScraper(BaseScraper):
         super().__init__(config, db_client)
         self._symbols = symbols
         self._use_browser = use_browser
+        self._keyword_matcher = _KeywordMatcher(self.KEYWORD_PATTERNS)
+
+        # One browser per run, shared by all symbols; tabs are capped
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._browser_lock = asyncio.Lock()
+        self._page_sem = asyncio.Semaphore(self.BROWSER_PAGES)
+
+        # Fallback timestamp for undated items; refreshed once per scrape pass
+        self._batch_now = datetime.now()
 
     def get_name(self) -> str:
         return "News"
@@ -66,15 +225,24 @@ class NewsScraper(BaseScraper):
             symbols = self.db.get_all_symbols()[:20]
 
         logger.info(f"Scraping news for {len(symbols)} stocks")
+        self._batch_now = datetime.now()
 
-        for symbol in symbols:
-            try:
-                news_items = await self.fetch_news_for_stock(symbol)
-                for item in news_items:
-                    self._save_news(item)
-                    count += 1
-            except Exception as e:
-                logger.warning(f"Failed to scrape news for {symbol}: {e}")
+        sem = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def fetch(symbol: str) -> list[NewsItem]:
+            async with sem:
+                return await self.fetch_news_for_stock(symbol)
+
+        results = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+
+        pending: list[NewsItem] = []
+        for symbol, result in zip(symbols, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to scrape news for {symbol}: {result}")
+                continue
+            pending.extend(result)
+
+        count += self._save_news(pending)
 
         return count
 
@@ -85,10 +253,18 @@ class NewsScraper(BaseScraper):
         if self._use_browser:
             news.extend(await self._fetch_with_browser(symbol))
         else:
-            news.extend(await self._fetch_kontan(symbol))
-            news.extend(await self._fetch_bisnis(symbol))
+            results = await asyncio.gather(
+                self._fetch_kontan(symbol),
+                self._fetch_bisnis(symbol),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.debug(f"News source failed for {symbol}: {result}")
+                else:
+                    news.extend(result)
 
-        return sorted(news, key=lambda n: n.published_at, reverse=True)[:10]
+        return heapq.nlargest(10, news, key=lambda n: n.published_at)
 
     async def _fetch_kontan(self, symbol: str) -> list[NewsItem]:
         """Fetch news from Kontan."""
@@ -100,31 +276,25 @@ class NewsScraper(BaseScraper):
             return news
 
         try:
-            soup = BeautifulSoup(response.text, "html.parser")
-            articles = soup.select(".list-news .news-item, .list-berita article")[:5]
-
-            for article in articles:
-                title_el = article.select_one("h3 a, .title a")
-                date_el = article.select_one(".date, .time")
-
-                if title_el:
-                    title = title_el.get_text(strip=True)
-                    href = str(title_el.get("href", ""))
-                    pub_date = self._parse_indo_date(
-                        date_el.get_text(strip=True) if date_el else None
-                    )
+            articles = _extract_articles(
+                response.text,
+                ".list-news .news-item, .list-berita article",
+                "h3 a, .title a",
+                ".date, .time",
+            )
 
-                    news.append(
-                        NewsItem(
-                            symbol=symbol,
-                            title=title,
-                            summary=None,
-                            source="kontan",
-                            url=href if href.startswith("http") else f"https://kontan.co.id{href}",
-                            published_at=pub_date,
-                            keywords=self._extract_keywords(title),
-                        )
+            for title, href, date_text in articles:
+                news.append(
+                    NewsItem(
+                        symbol=symbol,
+                        title=title,
+                        summary=None,
+                        source="kontan",
+                        url=href if href.startswith("http") else f"https://kontan.co.id{href}",
+                        published_at=self._parse_indo_date(date_text),
+                        keywords=self._extract_keywords(title),
                     )
+                )
         except Exception as e:
             logger.debug(f"Failed to parse Kontan news for {symbol}: {e}")
 
@@ -140,83 +310,108 @@ class NewsScraper(BaseScraper):
             return news
 
         try:
-            soup = BeautifulSoup(response.text, "html.parser")
-            articles = soup.select(".list-news article, .search-result-item")[:5]
-
-            for article in articles:
-                title_el = article.select_one("h2 a, .title a")
-                date_el = article.select_one(".date, time")
-
-                if title_el:
-                    title = title_el.get_text(strip=True)
-                    href = str(title_el.get("href", ""))
-                    pub_date = self._parse_indo_date(
-                        date_el.get_text(strip=True) if date_el else None
-                    )
+            articles = _extract_articles(
+                response.text,
+                ".list-news article, .search-result-item",
+                "h2 a, .title a",
+                ".date, time",
+            )
 
-                    news.append(
-                        NewsItem(
-                            symbol=symbol,
-                            title=title,
-                            summary=None,
-                            source="bisnis",
-                            url=href if href.startswith("http") else f"https://bisnis.com{href}",
-                            published_at=pub_date,
-                            keywords=self._extract_keywords(title),
-                        )
+            for title, href, date_text in articles:
+                news.append(
+                    NewsItem(
+                        symbol=symbol,
+                        title=title,
+                        summary=None,
+                        source="bisnis",
+                        url=href if href.startswith("http") else f"https://bisnis.com{href}",
+                        published_at=self._parse_indo_date(date_text),
+                        keywords=self._extract_keywords(title),
                     )
+                )
         except Exception as e:
             logger.debug(f"Failed to parse Bisnis news for {symbol}: {e}")
 
         return news
 
+    async def _get_browser(self) -> Any:
+        """Launch the shared headless browser on first use.
+
+        Returns:
+            Playwright browser reused for every symbol in the run
+        """
+        async with self._browser_lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    args=["--disable-dev-shm-usage", "--disable-gpu", "--no-sandbox"],
+                )
+            return self._browser
+
+    async def _close_browser(self) -> None:
+        """Close the shared browser and stop Playwright."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def close(self) -> None:
+        """Close browser, HTTP client and database connection."""
+        await self._close_browser()
+        await super().close()
+
     async def _fetch_with_browser(self, symbol: str) -> list[NewsItem]:
         """Fetch news using Playwright browser automation."""
         news: list[NewsItem] = []
 
         try:
-            from playwright.async_api import async_playwright
+            browser = await self._get_browser()
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with self._page_sem:
                 page = await browser.new_page()
+                try:
+                    search_url = f"https://investasi.kontan.co.id/search/?q={symbol}"
+                    await page.goto(search_url)
 
-                search_url = f"https://investasi.kontan.co.id/search/?q={symbol}"
-                await page.goto(search_url)
+                    try:
+                        await page.wait_for_selector(".list-news, .list-berita", timeout=10000)
+                    except Exception:
+                        logger.debug(f"Timeout waiting for news list for {symbol}")
+                        return news
 
-                try:
-                    await page.wait_for_selector(".list-news, .list-berita", timeout=10000)
-                except Exception:
-                    logger.debug(f"Timeout waiting for news list for {symbol}")
-                    await browser.close()
-                    return news
-
-                articles = await page.query_selector_all(
-                    ".list-news .news-item, .list-berita article"
-                )
+                    articles = await page.query_selector_all(
+                        ".list-news .news-item, .list-berita article"
+                    )
 
-                for article in articles[:5]:
-                    title_el = await article.query_selector("h3 a, .title a")
-                    date_el = await article.query_selector(".date, .time")
-
-                    if title_el:
-                        title = await title_el.inner_text()
-                        url = (await title_el.get_attribute("href")) or ""
-                        pub_date_str = await date_el.inner_text() if date_el else None
-
-                        news.append(
-                            NewsItem(
-                                symbol=symbol,
-                                title=title,
-                                summary=None,
-                                source="kontan",
-                                url=url if url.startswith("http") else f"https://kontan.co.id{url}",
-                                published_at=self._parse_indo_date(pub_date_str),
-                                keywords=self._extract_keywords(title),
+                    for article in articles[:5]:
+                        title_el = await article.query_selector("h3 a, .title a")
+                        date_el = await article.query_selector(".date, .time")
+
+                        if title_el:
+                            title = await title_el.inner_text()
+                            url = (await title_el.get_attribute("href")) or ""
+                            pub_date_str = await date_el.inner_text() if date_el else None
+
+                            news.append(
+                                NewsItem(
+                                    symbol=symbol,
+                                    title=title,
+                                    summary=None,
+                                    source="kontan",
+                                    url=url
+                                    if url.startswith("http")
+                                    else f"https://kontan.co.id{url}",
+                                    published_at=self._parse_indo_date(pub_date_str),
+                                    keywords=self._extract_keywords(title),
+                                )
                             )
-                        )
-
-                await browser.close()
+                finally:
+                    await page.close()
 
         except ImportError:
             logger.warning(
@@ -229,82 +424,60 @@ class NewsScraper(BaseScraper):
 
     def _extract_keywords(self, text: str) -> list[str]:
         """Extract relevant keywords from news title."""
-        keywords = []
-        text_lower = text.lower()
-
-        for keyword, triggers in self.KEYWORD_PATTERNS:
-            if any(t.lower() in text_lower for t in triggers):
-                keywords.append(keyword)
-
-        return keywords
+        return self._keyword_matcher.match(text.lower())
 
     def _parse_indo_date(self, date_str: str | None) -> datetime:
         """Parse Indonesian date string."""
         if not date_str:
-            return datetime.now()
+            return self._batch_now
 
         try:
             date_str = date_str.strip().lower()
 
-            if "hari" in date_str or "jam" in date_str or "menit" in date_str:
-                return datetime.now()
-
-            months: dict[str, int] = {
-                "januari": 1,
-                "februari": 2,
-                "maret": 3,
-                "april": 4,
-                "mei": 5,
-                "juni": 6,
-                "juli": 7,
-                "agustus": 8,
-                "september": 9,
-                "oktober": 10,
-                "november": 11,
-                "desember": 12,
-                "jan": 1,
-                "feb": 2,
-                "mar": 3,
-                "apr": 4,
-                "may": 5,
-                "jun": 6,
-                "jul": 7,
-                "aug": 8,
-                "sep": 9,
-                "oct": 10,
-                "nov": 11,
-                "dec": 12,
-            }
+            if _RELATIVE_DATE_RE.search(date_str):
+                return self._batch_now
 
-            for month_name, month_num in months.items():
-                if month_name in date_str:
-                    match = re.search(r"(\d{1,2})\s*" + month_name + r"\s*(\d{4})?", date_str)
-                    if match:
-                        day = int(match.group(1))
-                        year = int(match.group(2)) if match.group(2) else datetime.now().year
-                        return datetime(year, month_num, day)
+            match = _INDO_DATE_RE.search(date_str)
+            if match:
+                day = int(match.group(1))
+                year = int(match.group(3)) if match.group(3) else self._batch_now.year
+                return datetime(year, _MONTHS[match.group(2)], day)
 
         except Exception:
             pass
 
-        return datetime.now()
-
-    def _save_news(self, item: NewsItem) -> None:
-        """Save news item to database."""
-        self.db.execute(
-            """
-            INSERT INTO stock_news 
-            (symbol, title, summary, source, url, published_at, keywords)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
-            """,
-            (
-                item.symbol,
-                item.title,
-                item.summary,
-                item.source,
-                item.url,
-                item.published_at,
-                item.keywords,
-            ),
-        )
+        return self._batch_now
+
+    def _save_news(self, items: list[NewsItem]) -> int:
+        """Save news items to database in one batch.
+
+        If the batch fails, items are retried one by one so a single bad row
+        or a dropped connection does not lose the whole run.
+
+        Returns:
+            Number of records inserted
+        """
+        rows = [
+            {
+                "symbol": item.symbol,
+                "title": item.title,
+                "summary": item.summary,
+                "source": item.source,
+                "url": item.url,
+                "published_at": item.published_at,
+                "keywords": item.keywords,
+            }
+            for item in items
+        ]
+        try:
+            return self.db.insert_news_batch(rows)
+        except Exception as e:
+            logger.warning(f"Batch insert of {len(rows)} news items failed, retrying singly: {e}")
+
+        inserted = 0
+        for row in rows:
+            try:
+                inserted += self.db.insert_news_batch([row])
+            except Exception as e:
+                logger.warning(f"Failed to save news item {row['url']}: {e}")
+        return inserted
@@ -7,26 +7,33 @@ Sources:
 """
 
 import asyncio
+import calendar
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
+from typing import Any
 
+import numpy as np
 from loguru import logger
 
 from .base import BaseScraper, ScraperConfig
 from .database import DatabaseClient
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceBar:
-    """OHLCV price bar."""
+    """OHLCV price bar.
+
+    IDX prices trade in whole rupiah, so OHLC values are plain ints.
+    """
 
     symbol: str
     time: datetime
-    open: Decimal
-    high: Decimal
-    low: Decimal
-    close: Decimal
+    open: int
+    high: int
+    low: int
+    close: int
     volume: int
     value: Decimal | None = None
     frequency: int | None = None
@@ -38,6 +45,9 @@ class PriceHistoryScraper(BaseScraper):
     YAHOO_FINANCE_API = "https://query1.finance.yahoo.com/v8/finance/chart"
     IDX_API = "https://www.idx.co.id/primary"
 
+    # Tickers per yf.download call
+    YF_BATCH_SIZE = 50
+
     def __init__(
         self,
         config: ScraperConfig | None = None,
@@ -67,8 +77,6 @@ class PriceHistoryScraper(BaseScraper):
         Returns:
             Number of records scraped
         """
-        count = 0
-
         # Get symbols to scrape
         if self._symbols:
             symbols = self._symbols
@@ -77,68 +85,124 @@ class PriceHistoryScraper(BaseScraper):
 
         logger.info(f"Scraping price history for {len(symbols)} stocks ({self._days} days)")
 
-        # Scrape each stock
-        for i, symbol in enumerate(symbols):
-            logger.info(f"[{i+1}/{len(symbols)}] Scraping prices for {symbol}")
-            try:
-                # Check latest price date in database
-                latest_date = self.db.get_latest_price_date(symbol)
-                desired_start = date.today() - timedelta(days=self._days)
-
-                if latest_date:
-                    earliest_date = self.db.get_earliest_price_date(symbol)
-                    needs_backfill = earliest_date is None or earliest_date > desired_start
-
-                    if needs_backfill:
-                        start_date = desired_start
-                        if earliest_date is not None:
-                            logger.info(
-                                f"Backfilling {symbol} price history from {desired_start} "
-                                f"(earliest existing: {earliest_date})"
-                            )
-                    else:
-                        # Only fetch missing days
-                        start_date = latest_date + timedelta(days=1)
-                        if start_date > date.today():
-                            logger.debug(f"{symbol} already up to date")
-                            continue
-                else:
-                    # Fetch full history
-                    start_date = desired_start
-
-                end_date = date.today()
-
-                # Fetch prices
-                prices = await self._fetch_prices(symbol, start_date, end_date)
-                if prices:
-                    batch = [
-                        {
-                            "time": p.time,
-                            "symbol": p.symbol,
-                            "open": p.open,
-                            "high": p.high,
-                            "low": p.low,
-                            "close": p.close,
-                            "volume": p.volume,
-                            "value": p.value,
-                            "frequency": p.frequency,
-                        }
-                        for p in prices
-                    ]
-                    inserted = self.db.insert_prices_batch(batch)
-                    count += inserted
-                    logger.info(f"Inserted {inserted} price records for {symbol}")
+        end_date = date.today()
+
+        # Group symbols sharing a fetch window so Yahoo can serve them in one download
+        new_symbols: set[str] = set()
+        bounds = self.db.get_price_date_bounds()
+        buckets: dict[date, list[str]] = defaultdict(list)
+        for symbol in symbols:
+            earliest_date, latest_date = bounds.get(symbol, (None, None))
+            if latest_date is None:
+                new_symbols.add(symbol)
+            start_date = self._start_date(symbol, earliest_date, latest_date)
+            if start_date is not None:
+                buckets[start_date].append(symbol)
+
+        prefetched: dict[str, list[PriceBar]] = {}
+        for start_date, bucket in buckets.items():
+            if len(bucket) > 1:
+                prefetched.update(await self._fetch_yahoo_batch(bucket, start_date, end_date))
+
+        sem = asyncio.Semaphore(self.config.max_concurrency)
+        plan = [(s, start) for start, bucket in buckets.items() for s in bucket]
+        total = len(plan)
+
+        async def scrape_one(i: int, symbol: str, start_date: date) -> int:
+            async with sem:
+                logger.info(f"[{i + 1}/{total}] Scraping prices for {symbol}")
+                try:
+                    prices = prefetched.get(symbol) or await self._fetch_prices(
+                        symbol, start_date, end_date, has_history=symbol not in new_symbols
+                    )
+                    return self._store_prices(symbol, prices)
+                except Exception as e:
+                    logger.warning(f"Failed to scrape prices for {symbol}: {e}")
+                    return 0
 
-            except Exception as e:
-                logger.warning(f"Failed to scrape prices for {symbol}: {e}")
+        results = await asyncio.gather(
+            *(scrape_one(i, s, start) for i, (s, start) in enumerate(plan))
+        )
+        return sum(results)
+
+    def _start_date(
+        self,
+        symbol: str,
+        earliest_date: date | None,
+        latest_date: date | None,
+    ) -> date | None:
+        """Determine the first date of missing price history for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            earliest_date: Earliest stored price date
+            latest_date: Latest stored price date
+
+        Returns:
+            Start date to fetch from, or None if already up to date
+        """
+        desired_start = date.today() - timedelta(days=self._days)
+
+        if not latest_date:
+            # Fetch full history
+            return desired_start
+
+        needs_backfill = earliest_date is None or earliest_date > desired_start
+
+        if needs_backfill:
+            if earliest_date is not None:
+                logger.info(
+                    f"Backfilling {symbol} price history from {desired_start} "
+                    f"(earliest existing: {earliest_date})"
+                )
+            return desired_start
+
+        # Only fetch missing days. The end date is exclusive and IDX does not
+        # trade on weekends, so a window without a weekday has nothing to fetch
+        start_date = latest_date + timedelta(days=1)
+        gap = (date.today() - start_date).days
+        if all((start_date + timedelta(days=d)).weekday() >= 5 for d in range(gap)):
+            logger.debug(f"{symbol} already up to date")
+            return None
+        return start_date
 
-        return count
+    def _store_prices(self, symbol: str, prices: list[PriceBar]) -> int:
+        """Insert fetched price bars for one symbol.
+
+        Args:
+            symbol: Stock symbol
+            prices: Price bars to insert
+
+        Returns:
+            Number of records inserted
+        """
+        if not prices:
+            return 0
+
+        batch = [
+            {
+                "time": p.time,
+                "symbol": p.symbol,
+                "open": p.open,
+                "high": p.high,
+                "low": p.low,
+                "close": p.close,
+                "volume": p.volume,
+                "value": p.value,
+                "frequency": p.frequency,
+            }
+            for p in prices
+        ]
+        inserted = self.db.insert_prices_batch(batch)
+        logger.info(f"Inserted {inserted} price records for {symbol}")
+        return inserted
 
     async def _fetch_prices(
         self,
         symbol: str,
         start_date: date,
         end_date: date,
+        has_history: bool = True,
     ) -> list[PriceBar]:
         """Fetch price history from available sources.
 
@@ -146,15 +210,17 @@ class PriceHistoryScraper(BaseScraper):
             symbol: Stock symbol
             start_date: Start date
             end_date: End date
+            has_history: Whether prices for the symbol are already stored
 
         Returns:
             List of price bars
         """
         # Try Yahoo Finance first (most reliable for IDX stocks)
-        prices = await self._fetch_yahoo_finance(symbol, start_date, end_date)
+        prices, retryable = await self._fetch_yahoo_finance(symbol, start_date, end_date)
 
-        # Fallback to IDX API
-        if not prices:
+        # Fallback to IDX API when Yahoo failed, or when it has no bars for a
+        # symbol we have never stored (Yahoo may simply not list it)
+        if not prices and (retryable or not has_history):
             prices = await self._fetch_idx_api(symbol, start_date, end_date)
 
         return prices
@@ -164,7 +230,7 @@ class PriceHistoryScraper(BaseScraper):
         symbol: str,
         start_date: date,
         end_date: date,
-    ) -> list[PriceBar]:
+    ) -> tuple[list[PriceBar], bool]:
         """Fetch prices from Yahoo Finance using yfinance library.
 
         Args:
@@ -173,7 +239,9 @@ class PriceHistoryScraper(BaseScraper):
             end_date: End date
 
         Returns:
-            List of price bars
+            Tuple of (price bars, whether another source is worth trying).
+            An empty result without an error means Yahoo has no bars for the
+            window and is not retryable.
         """
         import yfinance as yf
 
@@ -184,33 +252,115 @@ class PriceHistoryScraper(BaseScraper):
 
         try:
             ticker = yf.Ticker(yf_symbol)
-            df = ticker.history(start=start_date, end=end_date)
+            # yfinance is blocking; keep the event loop free for other symbols.
+            # Without raise_errors it swallows network errors and rate limits
+            # and returns an empty frame, which would look like "no data"
+            df = await asyncio.to_thread(
+                ticker.history, start=start_date, end=end_date, raise_errors=True
+            )
 
             if df.empty:
                 logger.debug(f"No data from Yahoo Finance for {symbol}")
-                return prices
+                return prices, False
 
-            for idx, row in df.iterrows():
-                ts = idx.to_pydatetime().replace(tzinfo=UTC)
-                prices.append(
-                    PriceBar(
-                        symbol=symbol,
-                        time=ts,
-                        open=Decimal(str(round(row["Open"], 2))),
-                        high=Decimal(str(round(row["High"], 2))),
-                        low=Decimal(str(round(row["Low"], 2))),
-                        close=Decimal(str(round(row["Close"], 2))),
-                        volume=int(row["Volume"]),
-                    )
-                )
+            prices = self._bars_from_frame(symbol, df)
 
             logger.debug(f"Fetched {len(prices)} prices for {symbol} from Yahoo Finance")
 
         except Exception as e:
             logger.warning(f"Yahoo Finance error for {symbol}: {e}")
+            return prices, True
+
+        return prices, False
+
+    async def _fetch_yahoo_batch(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, list[PriceBar]]:
+        """Fetch prices for several symbols with batched yfinance downloads.
+
+        Args:
+            symbols: Stock symbols sharing the same window
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Price bars per symbol (symbols without data are omitted)
+        """
+        import yfinance as yf
+
+        prices: dict[str, list[PriceBar]] = {}
+
+        for i in range(0, len(symbols), self.YF_BATCH_SIZE):
+            chunk = symbols[i : i + self.YF_BATCH_SIZE]
+            tickers = [f"{s}.JK" for s in chunk]
+            try:
+                # Same adjustment as Ticker.history so both paths agree
+                df = await asyncio.to_thread(
+                    yf.download,
+                    tickers,
+                    start=start_date,
+                    end=end_date,
+                    group_by="ticker",
+                    threads=True,
+                    progress=False,
+                    auto_adjust=True,
+                )
+            except Exception as e:
+                logger.warning(f"Yahoo Finance batch error for {len(chunk)} symbols: {e}")
+                continue
+
+            if df is None or df.empty:
+                continue
+
+            for symbol, yf_symbol in zip(chunk, tickers, strict=True):
+                if yf_symbol not in df.columns.get_level_values(0):
+                    continue
+                # Rows missing any price (not just fully empty ones) cannot become bars
+                frame = df[yf_symbol].dropna(subset=["Open", "High", "Low", "Close"])
+                try:
+                    bars = self._bars_from_frame(symbol, frame)
+                except (TypeError, ValueError) as e:
+                    # Leave the symbol to the per-symbol fetch instead of failing the run
+                    logger.warning(f"Bad Yahoo Finance batch data for {symbol}: {e}")
+                    continue
+                if bars:
+                    prices[symbol] = bars
+
+            logger.debug(f"Fetched Yahoo Finance batch: {len(chunk)} symbols from {start_date}")
 
         return prices
 
+    @staticmethod
+    def _bars_from_frame(symbol: str, df: Any) -> list[PriceBar]:
+        """Convert a yfinance OHLCV frame into price bars.
+
+        Args:
+            symbol: Stock symbol
+            df: DataFrame indexed by timestamp with Open/High/Low/Close/Volume
+
+        Returns:
+            List of price bars
+        """
+        # Round the whole frame at once; itertuples avoids per-row Series boxing
+        ohlcv = df[["Open", "High", "Low", "Close", "Volume"]].round(
+            {"Open": 0, "High": 0, "Low": 0, "Close": 0}
+        )
+        return [
+            PriceBar(
+                symbol=symbol,
+                time=ts.to_pydatetime().replace(tzinfo=UTC),
+                open=int(o),
+                high=int(h),
+                low=int(lo),
+                close=int(c),
+                volume=int(v),
+            )
+            for ts, o, h, lo, c, v in ohlcv.itertuples(index=True, name=None)
+        ]
+
     async def _fetch_yahoo_finance_old(
         self,
         symbol: str,
@@ -232,9 +382,9 @@ class PriceHistoryScraper(BaseScraper):
         # Yahoo Finance uses .JK suffix for Indonesian stocks
         yf_symbol = f"{symbol}.JK"
 
-        # Convert dates to Unix timestamps
-        period1 = int(datetime.combine(start_date, datetime.min.time()).timestamp())
-        period2 = int(datetime.combine(end_date, datetime.max.time()).timestamp())
+        # Convert dates to Unix timestamps (UTC day bounds)
+        period1 = calendar.timegm(start_date.timetuple())
+        period2 = calendar.timegm(end_date.timetuple()) + 86399
 
         url = f"{self.YAHOO_FINANCE_API}/{yf_symbol}"
         params = {
@@ -260,35 +410,30 @@ class PriceHistoryScraper(BaseScraper):
             indicators = result.get("indicators", {})
             quote = indicators.get("quote", [{}])[0]
 
-            opens = quote.get("open", [])
-            highs = quote.get("high", [])
-            lows = quote.get("low", [])
-            closes = quote.get("close", [])
-            volumes = quote.get("volume", [])
-
-            for i, ts in enumerate(timestamps):
-                # Skip if any value is None
-                if any(
-                    v is None or (i < len(v) and v[i] is None)
-                    for v in [opens, highs, lows, closes, volumes]
-                ):
-                    continue
-
-                if i >= len(opens) or i >= len(closes):
-                    continue
-
-                dt = datetime.fromtimestamp(ts, tz=UTC)
-
-                price = PriceBar(
-                    symbol=symbol,
-                    time=dt,
-                    open=Decimal(str(opens[i])),
-                    high=Decimal(str(highs[i])),
-                    low=Decimal(str(lows[i])),
-                    close=Decimal(str(closes[i])),
-                    volume=int(volumes[i]) if volumes[i] else 0,
+            # Drop bars where any OHLCV field is null in one vectorized pass
+            ts = np.asarray(timestamps)
+            opens, highs, lows, closes, volumes = (
+                np.asarray(quote.get(key) or [], dtype=object)
+                for key in ("open", "high", "low", "close", "volume")
+            )
+            columns = (opens, highs, lows, closes, volumes)
+            n = min(len(ts), *(len(c) for c in columns))
+            mask = np.ones(n, dtype=bool)
+            for column in columns:
+                mask &= np.fromiter((v is not None for v in column[:n]), dtype=bool, count=n)
+
+            for i in np.flatnonzero(mask):
+                prices.append(
+                    PriceBar(
+                        symbol=symbol,
+                        time=datetime.fromtimestamp(int(ts[i]), tz=UTC),
+                        open=round(opens[i]),
+                        high=round(highs[i]),
+                        low=round(lows[i]),
+                        close=round(closes[i]),
+                        volume=int(volumes[i]) if volumes[i] else 0,
+                    )
                 )
-                prices.append(price)
 
             logger.debug(f"Fetched {len(prices)} prices from Yahoo Finance for {symbol}")
 
@@ -333,10 +478,10 @@ class PriceHistoryScraper(BaseScraper):
                 price = PriceBar(
                     symbol=symbol,
                     time=dt,
-                    open=Decimal(str(item.get("OpenPrice", item.get("Open", 0)))),
-                    high=Decimal(str(item.get("High", 0))),
-                    low=Decimal(str(item.get("Low", 0))),
-                    close=Decimal(str(item.get("ClosePrice", item.get("Close", 0)))),
+                    open=round(float(item.get("OpenPrice", item.get("Open", 0)))),
+                    high=round(float(item.get("High", 0))),
+                    low=round(float(item.get("Low", 0))),
+                    close=round(float(item.get("ClosePrice", item.get("Close", 0)))),
                     volume=int(item.get("Volume", 0)),
                     value=Decimal(str(item.get("Value", 0))) if item.get("Value") else None,
                     frequency=int(item.get("Frequency", 0)) if item.get("Frequency") else None,
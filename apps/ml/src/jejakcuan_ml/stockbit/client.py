@@ -1,13 +1,76 @@
 """Stockbit API client for social sentiment data."""
 
+import json
+import logging
 import re
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
+from itertools import islice
 
 import httpx
+from pydantic import BaseModel, Field, ValidationError
 
 from .models import PostType, StockbitPost, StockbitUser, StreamItem, SymbolSentiment
 
+logger = logging.getLogger(__name__)
+
+_DOLLAR_RE = re.compile(r"\$([A-Za-z]{4})")
+_JK_RE = re.compile(r"([A-Z]{4})\.JK")
+
+# Pump-and-dump red flags, matched in one pass; the lookahead reports
+# overlapping keywords like separate substring checks would
+_PUMP_KEYWORDS = (
+    "to the moon",
+    "🚀🚀🚀",
+    "guaranteed",
+    "pasti naik",
+    "buruan beli",
+    "jangan sampai ketinggalan",
+    "1000%",
+    "insider",
+    "rahasia",
+    "only today",
+    "hari ini saja",
+)
+_PUMP_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_PUMP_KEYWORDS, key=len, reverse=True)) + "))"
+)
+
+
+class _RawUser(BaseModel):
+    """User object as returned by the Stockbit API."""
+
+    id: str | int | None = ""
+    username: str | None = ""
+    display_name: str | None = ""
+    followers_count: int | None = 0
+    is_verified: bool | None = False
+    is_premium: bool | None = False
+
+
+class _RawPost(BaseModel):
+    """Stream post as returned by the Stockbit API."""
+
+    id: str | int | None = ""
+    type: str | None = "stream"
+    user: _RawUser = Field(default_factory=_RawUser)
+    content: str | None = None
+    body: str | None = None
+    symbol: str | None = None
+    # Parsed in pydantic-core; unparseable values stay as the raw string
+    created_at: datetime | str | None = Field(default=None, union_mode="left_to_right")
+    likes_count: int | None = 0
+    comments_count: int | None = 0
+    shares_count: int | None = 0
+    sentiment: str | None = None
+
+
+class _RawStream(BaseModel):
+    """Stream response envelope."""
+
+    data: list[_RawPost] = Field(default_factory=list)
+
 
 @dataclass
 class StockbitConfig:
@@ -15,6 +78,11 @@ class StockbitConfig:
 
     base_url: str = "https://stockbit.com/api"
     timeout: float = 30.0
+    # Connection pooling; HTTP/2 multiplexes stream fetches over one connection
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
     # Auth tokens if available (improves rate limits)
     access_token: str | None = None
 
@@ -37,6 +105,12 @@ class StockbitClient:
             base_url=self.config.base_url,
             timeout=self.config.timeout,
             headers=self._build_headers(),
+            http2=self.config.http2,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
         )
 
     def _build_headers(self) -> dict[str, str]:
@@ -75,18 +149,10 @@ class StockbitClient:
                 params={"limit": limit, "offset": offset},
             )
             response.raise_for_status()
-            data = response.json()
-
-            posts = []
-            for item in data.get("data", []):
-                post = self._parse_post(item)
-                if post:
-                    posts.append(post)
-
-            return posts
+            return self._parse_stream(response.content)
 
         except httpx.HTTPError as e:
-            print(f"Error fetching stream for {symbol}: {e}")
+            logger.warning("Error fetching stream for %s: %s", symbol, e)
             return []
 
     async def get_trending_stream(self, limit: int = 50) -> list[StockbitPost]:
@@ -104,18 +170,10 @@ class StockbitClient:
                 params={"limit": limit},
             )
             response.raise_for_status()
-            data = response.json()
-
-            posts = []
-            for item in data.get("data", []):
-                post = self._parse_post(item)
-                if post:
-                    posts.append(post)
-
-            return posts
+            return self._parse_stream(response.content)
 
         except httpx.HTTPError as e:
-            print(f"Error fetching trending stream: {e}")
+            logger.warning("Error fetching trending stream: %s", e)
             return []
 
     async def get_symbol_sentiment(self, symbol: str) -> SymbolSentiment | None:
@@ -131,43 +189,29 @@ class StockbitClient:
         if not posts:
             return None
 
-        positive = 0
-        negative = 0
-        neutral = 0
-        influencers: dict[str, int] = {}
-        sample_posts: list[str] = []
+        # Count by sentiment label
+        labels = Counter(post.sentiment_label or "neutral" for post in posts)
+        positive = labels["positive"]
+        negative = labels["negative"]
+        total = len(posts)
+        neutral = total - positive - negative
 
+        # Track influencers by engagement
+        influencers: Counter[str] = Counter()
         for post in posts:
-            # Count by sentiment label
-            label = post.sentiment_label or "neutral"
-            if label == "positive":
-                positive += 1
-            elif label == "negative":
-                negative += 1
-            else:
-                neutral += 1
-
-            # Track influencers by engagement
             if post.user.followers_count > 1000:
-                influencers[post.user.username] = influencers.get(
-                    post.user.username, 0
-                ) + post.likes_count
-
-            # Collect sample posts
-            if len(sample_posts) < 5 and len(post.content) > 20:
-                sample_posts.append(post.content[:200])
+                influencers[post.user.username] += post.likes_count
 
-        total = positive + negative + neutral
-        if total == 0:
-            return None
+        # Collect sample posts
+        sample_posts = list(
+            islice((p.content[:200] for p in posts if len(p.content) > 20), 5)
+        )
 
         # Calculate sentiment score (-1 to +1)
         sentiment_score = (positive - negative) / total
 
-        # Sort influencers by engagement
-        top_influencers = sorted(
-            influencers.keys(), key=lambda k: influencers[k], reverse=True
-        )[:5]
+        # Top influencers by engagement
+        top_influencers = [name for name, _ in influencers.most_common(5)]
 
         return SymbolSentiment(
             symbol=symbol,
@@ -200,77 +244,89 @@ class StockbitClient:
         else:
             posts = await self.get_trending_stream(limit)
 
-        items = []
-        for post in posts:
-            item = self._enrich_post(post)
-            items.append(item)
+        # One reference time for the whole batch
+        now = datetime.now(UTC)
+        return [self._enrich_post(post, now) for post in posts]
 
-        return items
+    def _parse_stream(self, content: bytes) -> list[StockbitPost]:
+        """Parse a stream response body into posts.
 
-    def _parse_post(self, data: dict) -> StockbitPost | None:
-        """Parse API response into StockbitPost."""
+        The whole page is validated straight from bytes in one pass; only if
+        some post does not fit the schema are posts validated one by one, so
+        a single malformed post does not drop the page.
+        """
         try:
-            user_data = data.get("user", {})
-            user = StockbitUser(
-                user_id=str(user_data.get("id", "")),
-                username=user_data.get("username", ""),
-                display_name=user_data.get("display_name", ""),
-                followers_count=user_data.get("followers_count", 0),
-                is_verified=user_data.get("is_verified", False),
-                is_premium=user_data.get("is_premium", False),
-            )
+            raw_posts = _RawStream.model_validate_json(content).data
+        except ValidationError:
+            raw_posts = []
+            for item in json.loads(content).get("data", []):
+                try:
+                    raw_posts.append(_RawPost.model_validate(item))
+                except ValidationError as e:
+                    logger.warning("Error parsing post: %s", e)
+
+        return [self._parse_post(raw) for raw in raw_posts]
+
+    def _parse_post(self, raw: _RawPost) -> StockbitPost:
+        """Convert a validated API post into StockbitPost."""
+        raw_user = raw.user
+        user = StockbitUser(
+            user_id=str(raw_user.id if raw_user.id is not None else ""),
+            username=raw_user.username or "",
+            display_name=raw_user.display_name or "",
+            followers_count=raw_user.followers_count or 0,
+            is_verified=bool(raw_user.is_verified),
+            is_premium=bool(raw_user.is_premium),
+        )
 
-            # Parse timestamp
-            created_str = data.get("created_at", "")
-            try:
-                created_at = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                created_at = datetime.now()
-
-            # Extract mentioned symbols from content
-            content = data.get("content", "") or data.get("body", "")
-            mentioned = self._extract_symbols(content)
-
-            post_type_str = data.get("type", "stream")
-            try:
-                post_type = PostType(post_type_str)
-            except ValueError:
-                post_type = PostType.STREAM
-
-            return StockbitPost(
-                post_id=str(data.get("id", "")),
-                post_type=post_type,
-                user=user,
-                content=content,
-                symbol=data.get("symbol"),
-                created_at=created_at,
-                likes_count=data.get("likes_count", 0),
-                comments_count=data.get("comments_count", 0),
-                shares_count=data.get("shares_count", 0),
-                sentiment_label=data.get("sentiment"),
-                mentioned_symbols=mentioned if mentioned else None,
-            )
+        # Timestamp was parsed during validation; fall back to now if it was not
+        if isinstance(raw.created_at, datetime):
+            created_at = raw.created_at
+        else:
+            created_at = datetime.now(UTC)
 
-        except Exception as e:
-            print(f"Error parsing post: {e}")
-            return None
+        # Extract mentioned symbols from content
+        content = raw.content or raw.body or ""
+        mentioned = self._extract_symbols(content)
+
+        try:
+            post_type = PostType(raw.type or "stream")
+        except ValueError:
+            post_type = PostType.STREAM
+
+        return StockbitPost(
+            post_id=str(raw.id if raw.id is not None else ""),
+            post_type=post_type,
+            user=user,
+            content=content,
+            symbol=raw.symbol,
+            created_at=created_at,
+            likes_count=raw.likes_count or 0,
+            comments_count=raw.comments_count or 0,
+            shares_count=raw.shares_count or 0,
+            sentiment_label=raw.sentiment,
+            mentioned_symbols=mentioned if mentioned else None,
+        )
 
     def _extract_symbols(self, text: str) -> list[str]:
         """Extract stock symbols from text."""
         symbols: set[str] = set()
 
         # $SYMBOL pattern
-        dollar_pattern = r"\$([A-Za-z]{4})"
-        symbols.update(m.upper() for m in re.findall(dollar_pattern, text))
+        symbols.update(m.upper() for m in _DOLLAR_RE.findall(text))
 
         # SYMBOL.JK pattern
-        jk_pattern = r"([A-Z]{4})\.JK"
-        symbols.update(re.findall(jk_pattern, text.upper()))
+        symbols.update(_JK_RE.findall(text.upper()))
 
         return list(symbols)[:10]
 
-    def _enrich_post(self, post: StockbitPost) -> StreamItem:
-        """Calculate enrichment scores for a post."""
+    def _enrich_post(self, post: StockbitPost, now: datetime | None = None) -> StreamItem:
+        """Calculate enrichment scores for a post.
+
+        Args:
+            post: Post to score
+            now: Timezone-aware reference time (defaults to current UTC time)
+        """
         # Engagement score (normalized)
         engagement = (
             post.likes_count * 1.0 + post.comments_count * 2.0 + post.shares_count * 3.0
@@ -278,7 +334,13 @@ class StockbitClient:
         engagement_score = min(engagement / 100, 1.0)
 
         # Virality score (based on recency + engagement)
-        hours_old = (datetime.now() - post.created_at).total_seconds() / 3600
+        if now is None:
+            now = datetime.now(UTC)
+        created_at = post.created_at
+        if created_at.tzinfo is None:
+            # Naive timestamps (parse fallback) are local time
+            created_at = created_at.astimezone()
+        hours_old = (now - created_at).total_seconds() / 3600
         recency_factor = max(0, 1 - hours_old / 24)  # Decays over 24h
         virality_score = engagement_score * recency_factor
 
@@ -305,22 +367,13 @@ class StockbitClient:
         """Detect potential pump-and-dump signals."""
         content_lower = post.content.lower()
 
-        # Red flags
-        pump_keywords = [
-            "to the moon",
-            "🚀🚀🚀",
-            "guaranteed",
-            "pasti naik",
-            "buruan beli",
-            "jangan sampai ketinggalan",
-            "1000%",
-            "insider",
-            "rahasia",
-            "only today",
-            "hari ini saja",
-        ]
-
-        keyword_count = sum(1 for kw in pump_keywords if kw in content_lower)
+        # Red flags: stop scanning once two distinct keywords are seen
+        seen: set[str] = set()
+        for match in _PUMP_RE.finditer(content_lower):
+            seen.add(match.group(1))
+            if len(seen) >= 2:
+                break
+        keyword_count = len(seen)
 
         # New/low-follower account pushing aggressively
         low_cred_high_engagement = (
@@ -15,7 +15,7 @@ class PostType(str, Enum):
     COMMENT = "comment"
 
 
-@dataclass
+@dataclass(slots=True)
 class StockbitUser:
     """Stockbit user info."""
 
@@ -27,7 +27,7 @@ class StockbitUser:
     is_premium: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class StockbitPost:
     """Stockbit post/stream item."""
 
@@ -44,7 +44,7 @@ class StockbitPost:
     mentioned_symbols: list[str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamItem:
     """Aggregated stream item with enriched data."""
 
@@ -55,7 +55,7 @@ class StreamItem:
     is_potential_pump: bool = False  # Flag for suspicious activity
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolSentiment:
     """Aggregated sentiment for a symbol."""
 
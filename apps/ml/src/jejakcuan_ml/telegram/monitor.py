@@ -1,14 +1,19 @@
 """Telegram channel monitoring for Indonesian stock groups."""
 
 import asyncio
+import inspect
+import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable
+from typing import cast
 
 from .parser import TelegramMessageParser
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class TelegramMessage:
     """Parsed Telegram message."""
 
@@ -58,20 +63,62 @@ class TelegramMonitor:
         self.parser = TelegramMessageParser()
         self._client = None
         self._running = False
-        self._message_handlers: list[Callable[[TelegramMessage], None]] = []
+        self._sync_handlers: list[Callable[[TelegramMessage], None | Awaitable[None]]] = []
+        self._async_handlers: list[Callable[[TelegramMessage], Awaitable[None]]] = []
 
     @property
     def channels(self) -> list[str]:
         """Get list of channels to monitor."""
         return self.config.channels or self.DEFAULT_CHANNELS
 
-    def add_handler(self, handler: Callable[[TelegramMessage], None]) -> None:
+    def add_handler(
+        self,
+        handler: Callable[[TelegramMessage], None | Awaitable[None]],
+    ) -> None:
         """Add message handler callback.
 
         Args:
-            handler: Function called with each new message
+            handler: Function or coroutine function called with each new message
         """
-        self._message_handlers.append(handler)
+        # Callable objects with ``async def __call__`` are coroutine functions too
+        if inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+            getattr(handler, "__call__", None)
+        ):
+            self._async_handlers.append(cast(Callable[[TelegramMessage], Awaitable[None]], handler))
+        else:
+            self._sync_handlers.append(handler)
+
+    async def _dispatch(self, msg: TelegramMessage) -> None:
+        """Pass a message to every registered handler.
+
+        A failing handler is reported without stopping the others.
+
+        Args:
+            msg: Message to dispatch
+        """
+        # One try per handler so a failing handler cannot starve the rest; entering a
+        # try block costs nothing on Python 3.11+ (zero-cost exception handling)
+        for h in self._sync_handlers:
+            try:
+                # Awaitables from handlers not detected as async (e.g. wrapped ones)
+                returned = h(msg)
+                if inspect.isawaitable(returned):
+                    await returned
+            except Exception:
+                logger.exception("Handler error in %s", getattr(h, "__qualname__", h))
+
+        if self._async_handlers:
+            results = await asyncio.gather(
+                *(h(msg) for h in self._async_handlers), return_exceptions=True
+            )
+            for async_handler, result in zip(self._async_handlers, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Handler error in %s: %s",
+                        getattr(async_handler, "__qualname__", async_handler),
+                        result,
+                        exc_info=result,
+                    )
 
     async def connect(self) -> bool:
         """Connect to Telegram.
@@ -93,10 +140,10 @@ class TelegramMonitor:
             return await self._client.is_user_authorized()
 
         except ImportError:
-            print("telethon not installed. Install with: pip install telethon")
+            logger.warning("telethon not installed. Install with: pip install telethon")
             return False
         except Exception as e:
-            print(f"Failed to connect to Telegram: {e}")
+            logger.warning("Failed to connect to Telegram: %s", e)
             return False
 
     async def disconnect(self) -> None:
@@ -153,7 +200,7 @@ class TelegramMonitor:
                         messages.append(parsed)
 
         except Exception as e:
-            print(f"Error fetching messages from {channel}: {e}")
+            logger.warning("Error fetching messages from %s: %s", channel, e)
 
         return messages
 
@@ -185,21 +232,16 @@ class TelegramMonitor:
                     sender_name=getattr(event.sender, "username", None),
                 )
 
-                # Call all handlers
-                for h in self._message_handlers:
-                    try:
-                        h(msg)
-                    except Exception as e:
-                        print(f"Handler error: {e}")
+                await self._dispatch(msg)
 
             # Keep running until stopped
             while self._running:
                 await asyncio.sleep(1)
 
         except ImportError:
-            print("telethon not installed")
-        except Exception as e:
-            print(f"Monitoring error: {e}")
+            logger.warning("telethon not installed")
+        except Exception:
+            logger.exception("Monitoring error")
         finally:
             self._running = False
 
@@ -219,10 +261,17 @@ class TelegramMonitor:
         Returns:
             Dict mapping channel name to messages
         """
-        results: dict[str, list[TelegramMessage]] = {}
+        channels = self.channels
+        histories = await asyncio.gather(
+            *(self.get_channel_history(c, limit_per_channel) for c in channels),
+            return_exceptions=True,
+        )
 
-        for channel in self.channels:
-            messages = await self.get_channel_history(channel, limit_per_channel)
+        results: dict[str, list[TelegramMessage]] = {}
+        for channel, messages in zip(channels, histories, strict=True):
+            if isinstance(messages, BaseException):
+                logger.warning("Error fetching messages from %s: %s", channel, messages)
+                messages = []
             results[channel] = messages
 
         return results
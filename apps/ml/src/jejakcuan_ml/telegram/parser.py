@@ -1,10 +1,50 @@
 """Telegram message parser for stock-related content."""
 
 import re
+import string
 from dataclasses import dataclass
+from typing import Any
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+_DOLLAR_SEARCH_RE = re.compile(r"\$[A-Za-z]{4}")
+_JK_RE = re.compile(r"([A-Z]{4})\.JK")
+# $SYMBOL or SYMBOL.JK in one pass, any ASCII case. Only the "$" is consumed,
+# so a $ mention never hides a .JK mention that starts inside it.
+_DOLLAR_JK_RE = re.compile(r"\$(?=([A-Za-z]{4}))|([A-Za-z]{4})\.[Jj][Kk]")
+_CONTEXT_RE = re.compile(r"(?:saham|emiten|kode|ticker)\s+([A-Z]{4})")
+_HYPE_EMOJIS = ("🚀", "🔥", "💰", "💎", "📈", "📉")
+_URGENT_WORDS = ("urgent", "now", "segera", "cepat", "buruan", "alert")
+_REPEAT_RE = re.compile(r"(.)\1{3,}")
+_WORD_RE = re.compile(r"[a-z]+")
+_ASCII_UPPER = string.ascii_uppercase.encode()
+
+
+def _keyword_regex(keywords: frozenset[str]) -> re.Pattern[str]:
+    """Compile keywords into one alternation scanned in a single pass.
+
+    The lookahead reports overlapping matches (e.g. "buy" inside "net buy"),
+    so findall yields every keyword occurrence like per-keyword ``in`` checks.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+
+def _keyword_automaton(keywords: frozenset[str]) -> Any:
+    """Build a pyahocorasick automaton over keywords, or None if unavailable."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedStockMention:
     """Extracted stock mention from message."""
 
@@ -17,117 +57,134 @@ class TelegramMessageParser:
     """Parse Telegram messages for stock-related content."""
 
     # Indonesian stock-related keywords
-    STOCK_KEYWORDS = {
-        "saham",
-        "emiten",
-        "ihsg",
-        "idx",
-        "bursa",
-        "trading",
-        "bullish",
-        "bearish",
-        "support",
-        "resistance",
-        "breakout",
-        "breakdown",
-        "trending",
-        "akumulasi",
-        "distribusi",
-        "bandarmology",
-        "foreign",
-        "asing",
-        "net buy",
-        "net sell",
-        "all time high",
-        "ath",
-        "cut loss",
-        "take profit",
-        "tp",
-        "sl",
-        "lot",
-        "volume",
-        "bid",
-        "offer",
-        "eps",
-        "per",
-        "pbv",
-        "dividend",
-        "dividen",
-        "right issue",
-        "stock split",
-    }
+    STOCK_KEYWORDS = frozenset(
+        {
+            "saham",
+            "emiten",
+            "ihsg",
+            "idx",
+            "bursa",
+            "trading",
+            "bullish",
+            "bearish",
+            "support",
+            "resistance",
+            "breakout",
+            "breakdown",
+            "trending",
+            "akumulasi",
+            "distribusi",
+            "bandarmology",
+            "foreign",
+            "asing",
+            "net buy",
+            "net sell",
+            "all time high",
+            "ath",
+            "cut loss",
+            "take profit",
+            "tp",
+            "sl",
+            "lot",
+            "volume",
+            "bid",
+            "offer",
+            "eps",
+            "per",
+            "pbv",
+            "dividend",
+            "dividen",
+            "right issue",
+            "stock split",
+        }
+    )
 
     # Bullish indicators
-    BULLISH_KEYWORDS = {
-        "bullish",
-        "naik",
-        "up",
-        "buy",
-        "beli",
-        "akumulasi",
-        "breakout",
-        "mantap",
-        "cuan",
-        "profit",
-        "terbang",
-        "rocket",
-        "moon",
-        "strong",
-        "kuat",
-        "net buy",
-        "ath",
-        "all time high",
-    }
+    BULLISH_KEYWORDS = frozenset(
+        {
+            "bullish",
+            "naik",
+            "up",
+            "buy",
+            "beli",
+            "akumulasi",
+            "breakout",
+            "mantap",
+            "cuan",
+            "profit",
+            "terbang",
+            "rocket",
+            "moon",
+            "strong",
+            "kuat",
+            "net buy",
+            "ath",
+            "all time high",
+        }
+    )
 
     # Bearish indicators
-    BEARISH_KEYWORDS = {
-        "bearish",
-        "turun",
-        "down",
-        "sell",
-        "jual",
-        "distribusi",
-        "breakdown",
-        "cut loss",
-        "rugi",
-        "loss",
-        "jebol",
-        "anjlok",
-        "weak",
-        "lemah",
-        "net sell",
-        "koreksi",
-    }
+    BEARISH_KEYWORDS = frozenset(
+        {
+            "bearish",
+            "turun",
+            "down",
+            "sell",
+            "jual",
+            "distribusi",
+            "breakdown",
+            "cut loss",
+            "rugi",
+            "loss",
+            "jebol",
+            "anjlok",
+            "weak",
+            "lemah",
+            "net sell",
+            "koreksi",
+        }
+    )
+
+    _STOCK_KEYWORDS_RE = _keyword_regex(STOCK_KEYWORDS)
+    # Scans text once for all keywords; None falls back to the regex above
+    _STOCK_KEYWORDS_AUTOMATON = _keyword_automaton(STOCK_KEYWORDS)
+    # Single words are matched by set intersection, phrases by substring
+    _BULLISH_WORDS = frozenset(k for k in BULLISH_KEYWORDS if " " not in k)
+    _BULLISH_PHRASES = tuple(k for k in BULLISH_KEYWORDS if " " in k)
+    _BEARISH_WORDS = frozenset(k for k in BEARISH_KEYWORDS if " " not in k)
+    _BEARISH_PHRASES = tuple(k for k in BEARISH_KEYWORDS if " " in k)
 
     # Non-ticker 4-letter Indonesian words
-    NON_TICKERS = {
-        "YANG",
-        "AKAN",
-        "DARI",
-        "PADA",
-        "AGAR",
-        "JIKA",
-        "TAPI",
-        "ATAU",
-        "BISA",
-        "KAMI",
-        "MAKA",
-        "JUGA",
-        "SAMA",
-        "LAIN",
-        "DARI",
-        "SAYA",
-        "KITA",
-        "ANDA",
-        "SINI",
-        "SANA",
-        "MASA",
-        "WAKTU",
-        "HARI",
-        "PAGI",
-        "SORE",
-        "MALAM",
-    }
+    NON_TICKERS = frozenset(
+        {
+            "YANG",
+            "AKAN",
+            "DARI",
+            "PADA",
+            "AGAR",
+            "JIKA",
+            "TAPI",
+            "ATAU",
+            "BISA",
+            "KAMI",
+            "MAKA",
+            "JUGA",
+            "SAMA",
+            "LAIN",
+            "SAYA",
+            "KITA",
+            "ANDA",
+            "SINI",
+            "SANA",
+            "MASA",
+            "HARI",
+            "PAGI",
+            "SORE",
+        }
+    )
+
+    # Standalone 4 uppercase letters, rejecting NON_TICKERS inside the engine
+    _STANDALONE_RE = re.compile(r"\b(?!(?:" + "|".join(sorted(NON_TICKERS)) + r")\b)([A-Z]{4})\b")
 
     def is_stock_related(self, text: str) -> bool:
         """Check if message is stock-related.
@@ -138,22 +195,28 @@ class TelegramMessageParser:
         Returns:
             True if message appears to be about stocks
         """
+        # Check for $ mentions first (common in stock discussions, cheapest test)
+        if "$" in text and _DOLLAR_SEARCH_RE.search(text):
+            return True
+
         text_lower = text.lower()
 
+        # SYMBOL.JK mentions
+        if ".jk" in text_lower and _JK_RE.search(text.upper()):
+            return True
+
         # Check for stock keywords
-        for keyword in self.STOCK_KEYWORDS:
-            if keyword in text_lower:
+        if self._STOCK_KEYWORDS_AUTOMATON is not None:
+            if next(self._STOCK_KEYWORDS_AUTOMATON.iter(text_lower), None) is not None:
                 return True
+        elif self._STOCK_KEYWORDS_RE.search(text_lower):
+            return True
 
-        # Check for stock ticker patterns
+        # Check for remaining stock ticker patterns
         symbols = self.extract_symbols(text)
         if symbols:
             return True
 
-        # Check for $ mentions (common in stock discussions)
-        if re.search(r"\$[A-Za-z]{4}", text):
-            return True
-
         return False
 
     def extract_symbols(self, text: str) -> list[str]:
@@ -167,22 +230,14 @@ class TelegramMessageParser:
         """
         symbols: set[str] = set()
 
-        # Pattern 1: $SYMBOL (common in social media)
-        dollar_pattern = r"\$([A-Za-z]{4})"
-        symbols.update(m.upper() for m in re.findall(dollar_pattern, text))
-
-        # Pattern 2: SYMBOL.JK (Yahoo Finance format)
-        jk_pattern = r"([A-Z]{4})\.JK"
-        symbols.update(re.findall(jk_pattern, text.upper()))
+        # Patterns 1 and 2: $SYMBOL (social media) and SYMBOL.JK (Yahoo Finance)
+        symbols.update((dollar or jk).upper() for dollar, jk in _DOLLAR_JK_RE.findall(text))
 
         # Pattern 3: Context-based extraction
-        context_pattern = r"(?:saham|emiten|kode|ticker)\s+([A-Z]{4})"
-        symbols.update(re.findall(context_pattern, text.upper()))
+        symbols.update(_CONTEXT_RE.findall(text.upper()))
 
         # Pattern 4: Standalone 4 uppercase letters
-        standalone_pattern = r"\b([A-Z]{4})\b"
-        potential = re.findall(standalone_pattern, text)
-        symbols.update(s for s in potential if s not in self.NON_TICKERS)
+        symbols.update(self._STANDALONE_RE.findall(text))
 
         return list(symbols)[:10]
 
@@ -197,13 +252,27 @@ class TelegramMessageParser:
         """
         mentions: list[ParsedStockMention] = []
         symbols = self.extract_symbols(text)
-        text_lower = text.lower()
 
         for symbol in symbols:
-            # Get surrounding context (30 chars before and after)
-            pattern = rf"(.{{0,30}}{re.escape(symbol)}.{{0,30}})"
-            match = re.search(pattern, text, re.IGNORECASE)
-            context = match.group(1) if match else symbol
+            # Get surrounding context (30 chars before and after, same line).
+            # Like a greedy (.{0,30}SYMBOL.{0,30}) search, the window starts up
+            # to 30 chars before the first mention and ends after the last
+            # mention reachable from there. Positions come from ``text`` itself;
+            # ``text.lower()`` can change length (e.g. "İ") and shift them.
+            needle = re.compile(f"(?=(?i:{symbol}))")
+            first = needle.search(text)
+            if first is not None:
+                idx = first.start()
+                line_start = text.rfind("\n", 0, idx) + 1
+                line_end = text.find("\n", idx)
+                if line_end < 0:
+                    line_end = len(text)
+                start = max(idx - 30, line_start)
+                reachable = needle.finditer(text, start, min(start + 30 + len(symbol), line_end))
+                last = max(m.start() for m in reachable)
+                context = text[start : min(last + len(symbol) + 30, line_end)]
+            else:
+                context = symbol
 
             # Detect sentiment hint from context
             sentiment_hint = self._detect_sentiment_hint(context.lower())
@@ -227,8 +296,14 @@ class TelegramMessageParser:
         Returns:
             "bullish", "bearish", or None
         """
-        bullish_count = sum(1 for kw in self.BULLISH_KEYWORDS if kw in context)
-        bearish_count = sum(1 for kw in self.BEARISH_KEYWORDS if kw in context)
+        # Each distinct keyword counts once, however often it appears
+        tokens = set(_WORD_RE.findall(context))
+        bullish_count = len(tokens & self._BULLISH_WORDS) + sum(
+            p in context for p in self._BULLISH_PHRASES
+        )
+        bearish_count = len(tokens & self._BEARISH_WORDS) + sum(
+            p in context for p in self._BEARISH_PHRASES
+        )
 
         if bullish_count > bearish_count:
             return "bullish"
@@ -254,22 +329,23 @@ class TelegramMessageParser:
         score += min(exclamations * 0.1, 0.3)
 
         # CAPS indicate emphasis
-        caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
+        # ASCII capitals, counted in C by deleting A-Z from the encoded text
+        encoded = text.encode()
+        caps = len(encoded) - len(encoded.translate(None, _ASCII_UPPER))
+        caps_ratio = caps / max(len(text), 1)
         score += min(caps_ratio, 0.3)
 
         # Emojis/rockets/fire indicate hype
-        hype_emojis = len(re.findall(r"[🚀🔥💰💎📈📉]", text))
+        hype_emojis = sum(text.count(e) for e in _HYPE_EMOJIS)
         score += min(hype_emojis * 0.05, 0.2)
 
         # Repetition (e.g., "BUYYYY")
-        if re.search(r"(.)\1{3,}", text):
+        if _REPEAT_RE.search(text):
             score += 0.1
 
         # Urgent words
-        urgent_words = ["urgent", "now", "segera", "cepat", "buruan", "alert"]
-        for word in urgent_words:
-            if word in text.lower():
-                score += 0.1
-                break
+        text_lower = text.lower()
+        if any(word in text_lower for word in _URGENT_WORDS):
+            score += 0.1
 
         return min(score, 1.0)
@@ -1,16 +1,68 @@
 """LSTM model training pipeline."""
 
 import json
-from datetime import datetime
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
 from pathlib import Path
+from types import ModuleType
+from typing import Literal
 
 import numpy as np
 import torch
 import torch.nn as nn
-from torch.utils.data import DataLoader, TensorDataset
+from numpy.lib.stride_tricks import sliding_window_view
 
 from ..models.lstm import StockLSTM
 
+numba: ModuleType | None
+try:
+    import numba as _numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+else:
+    numba = _numba
+
+orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+else:
+    orjson = _orjson
+
+# Validation sequences per forward pass (the staged set is scored in a few large chunks)
+VAL_CHUNK_SIZE = 4096
+
+# Datasets are staged on the GPU only when they take at most this share of free memory
+DEVICE_STAGING_FRACTION = 0.5
+
+# Inputs at least this long build their sequences with the parallel numba kernel
+NUMBA_MIN_SAMPLES = 50_000
+
+if numba is not None:
+    _prange = numba.prange
+
+    def _build_sequences_kernel(
+        features: np.ndarray, labels: np.ndarray, seq_len: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Copy every window into a preallocated buffer, one sequence per thread."""
+        n = features.shape[0] - seq_len
+        num_features = features.shape[1]
+        x_seq = np.empty((n, seq_len, num_features), dtype=np.float32)
+        y_seq = np.empty(n, dtype=np.int64)
+        for i in _prange(n):
+            for j in range(seq_len):
+                for k in range(num_features):
+                    x_seq[i, j, k] = features[i + j, k]
+            y_seq[i] = labels[i + seq_len]
+        return x_seq, y_seq
+
+    # Compiled explicitly so the kernel keeps a typed signature (numba is untyped)
+    _build_sequences_numba: Callable[
+        [np.ndarray, np.ndarray, int], tuple[np.ndarray, np.ndarray]
+    ] = numba.njit(parallel=True, cache=True)(_build_sequences_kernel)
+
 
 class LSTMTrainer:
     """Trainer for LSTM stock prediction model."""
@@ -25,6 +77,8 @@ class LSTMTrainer:
         batch_size: int = 32,
         epochs: int = 100,
         early_stopping_patience: int = 10,
+        compile_model: bool = False,
+        precision: Literal["fp32", "fp16", "bf16"] = "fp32",
     ):
         self.input_size = input_size
         self.hidden_size = hidden_size
@@ -38,6 +92,19 @@ class LSTMTrainer:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model: StockLSTM | None = None
 
+        # Opt-in mixed precision (CUDA only): BF16 autocast needs no loss scaling and
+        # falls back to FP16 autocast with a GradScaler where the GPU lacks BF16
+        if self.device.type != "cuda":
+            precision = "fp32"
+        elif precision == "bf16" and not torch.cuda.is_bf16_supported():
+            precision = "fp16"
+        self.precision = precision
+        self.use_amp = precision != "fp32"
+        self.amp_dtype = torch.bfloat16 if precision == "bf16" else torch.float16
+
+        # Opt-in: compile the training forward pass with TorchInductor CUDA graphs
+        self.compile_model = compile_model and self.device.type == "cuda"
+
         # Normalization stats
         self.feature_means: np.ndarray | None = None
         self.feature_stds: np.ndarray | None = None
@@ -54,16 +121,27 @@ class LSTMTrainer:
             labels: Shape (num_samples,) - class labels (0, 1, 2)
 
         Returns:
-            x_seq: Shape (num_sequences, seq_len, num_features)
-            y_seq: Shape (num_sequences,)
+            x_seq: Shape (num_sequences, seq_len, num_features), float32
+            y_seq: Shape (num_sequences,), int64
         """
-        x_seq, y_seq = [], []
+        seq_len = self.sequence_length
+        if len(features) <= seq_len:
+            return (
+                np.empty((0, seq_len, features.shape[1]), dtype=np.float32),
+                np.empty(0, dtype=np.int64),
+            )
+
+        if numba is not None and len(features) >= NUMBA_MIN_SAMPLES:
+            return _build_sequences_numba(
+                np.ascontiguousarray(features), np.ascontiguousarray(labels), seq_len
+            )
 
-        for i in range(len(features) - self.sequence_length):
-            x_seq.append(features[i : i + self.sequence_length])
-            y_seq.append(labels[i + self.sequence_length])
+        # Zero-copy (N - L + 1, F, L) window view; the last window has no label
+        windows = sliding_window_view(features, seq_len, axis=0)[:-1]
+        x_seq = np.ascontiguousarray(windows.transpose(0, 2, 1), dtype=np.float32)
+        y_seq = labels[seq_len:].astype(np.int64, copy=False)
 
-        return np.array(x_seq), np.array(y_seq)
+        return x_seq, y_seq
 
     def normalize_features(self, features: np.ndarray, fit: bool = False) -> np.ndarray:
         """Normalize features.
@@ -76,13 +154,62 @@ class LSTMTrainer:
             Normalized features
         """
         if fit:
+            # Center once and reuse it for both the std and the output
             self.feature_means = features.mean(axis=0)
-            self.feature_stds = features.std(axis=0)
+            centered: np.ndarray = features - self.feature_means
+            self.feature_stds = np.sqrt(np.square(centered).mean(axis=0))
+            centered *= 1.0 / (self.feature_stds + 1e-8)
+            return centered
 
         if self.feature_means is None or self.feature_stds is None:
             return features
 
-        return (features - self.feature_means) / (self.feature_stds + 1e-8)
+        normalized: np.ndarray = (features - self.feature_means) * (
+            1.0 / (self.feature_stds + 1e-8)
+        )
+        return normalized
+
+    def _fits_on_device(self, *tensors: torch.Tensor) -> bool:
+        """Check whether tensors can be staged on the device with room to spare.
+
+        Args:
+            tensors: Host tensors to stage
+
+        Returns:
+            True if they fit within ``DEVICE_STAGING_FRACTION`` of free memory
+        """
+        if self.device.type != "cuda":
+            return True
+        free, _ = torch.cuda.mem_get_info(self.device)
+        return sum(t.nbytes for t in tensors) <= free * DEVICE_STAGING_FRACTION
+
+    def _autocast(self) -> torch.autocast:
+        """Autocast context for forward passes (a no-op unless AMP is enabled)."""
+        return torch.autocast(self.device.type, dtype=self.amp_dtype, enabled=self.use_amp)
+
+    @contextmanager
+    def _fast_kernels(self) -> Iterator[None]:
+        """Relax FP32 numerics for the duration of an opted-in mixed precision run.
+
+        TF32 matmuls and cuDNN autotuning change results like AMP does, so they are
+        only enabled with ``precision != "fp32"``, and the process-global settings
+        are restored afterwards.
+        """
+        if not self.use_amp:
+            yield
+            return
+
+        matmul_precision = torch.get_float32_matmul_precision()
+        cudnn_benchmark = torch.backends.cudnn.benchmark
+        # Allow TF32 for the matmuls left in FP32
+        torch.set_float32_matmul_precision("high")
+        # Batch shapes are fixed, so let cuDNN autotune the LSTM kernels once per shape
+        torch.backends.cudnn.benchmark = True
+        try:
+            yield
+        finally:
+            torch.set_float32_matmul_precision(matmul_precision)
+            torch.backends.cudnn.benchmark = cudnn_benchmark
 
     def train(
         self,
@@ -102,6 +229,17 @@ class LSTMTrainer:
         Returns:
             Training history dict
         """
+        with self._fast_kernels():
+            return self._train(x_train, y_train, x_val, y_val)
+
+    def _train(
+        self,
+        x_train: np.ndarray,
+        y_train: np.ndarray,
+        x_val: np.ndarray | None,
+        y_val: np.ndarray | None,
+    ) -> dict[str, list[float]]:
+        """Run the training loop (see ``train``)."""
         # Create model
         self.model = StockLSTM(
             input_size=self.input_size,
@@ -109,34 +247,64 @@ class LSTMTrainer:
             num_layers=self.num_layers,
             num_classes=3,
         ).to(self.device)
+        # Training steps go through the compiled wrapper; validation uses the eager
+        # module (other shapes, eval mode), and state_dict keys stay unchanged
+        forward = (
+            torch.compile(self.model, mode="reduce-overhead") if self.compile_model else self.model
+        )
+
+        # from_numpy shares the array buffers (no copy when already float32/int64)
+        x_train_t = torch.from_numpy(np.ascontiguousarray(x_train, dtype=np.float32))
+        y_train_t = torch.from_numpy(np.ascontiguousarray(y_train, dtype=np.int64))
 
         # Loss and optimizer
         # Use class weights for imbalanced data
-        class_counts = np.bincount(y_train.astype(int), minlength=3)
+        class_counts = torch.bincount(y_train_t, minlength=3).double()
         class_weights = 1.0 / (class_counts + 1)
         class_weights = class_weights / class_weights.sum()
-        weights = torch.FloatTensor(class_weights).to(self.device)
+        weights = class_weights.float().to(self.device)
 
         criterion = nn.CrossEntropyLoss(weight=weights)
-        optimizer = torch.optim.Adam(self.model.parameters(), lr=self.learning_rate)
+        val_criterion = nn.CrossEntropyLoss(weight=weights, reduction="sum")
+        # Fused Adam updates every parameter in a single CUDA kernel
+        optimizer = torch.optim.Adam(
+            self.model.parameters(), lr=self.learning_rate, fused=self.device.type == "cuda"
+        )
         scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(
             optimizer, mode="min", factor=0.5, patience=5
         )
-
-        # Create data loaders
-        train_dataset = TensorDataset(
-            torch.FloatTensor(x_train),
-            torch.LongTensor(y_train),
+        # Multi-tensor kernels for clipping (CUDA only on older torch releases)
+        foreach = self.device.type == "cuda"
+        scaler = torch.amp.GradScaler(self.device.type, enabled=self.precision == "fp16")
+
+        # Stage the training set on the device once when it fits; each epoch gathers
+        # its batches from a fresh permutation instead of going through a DataLoader.
+        # Larger sets stay on the host and each gathered batch is copied over.
+        train_device = (
+            self.device if self._fits_on_device(x_train_t, y_train_t) else torch.device("cpu")
         )
-        train_loader = DataLoader(train_dataset, batch_size=self.batch_size, shuffle=True)
-
-        val_loader = None
+        x_train_t = x_train_t.to(train_device)
+        y_train_t = y_train_t.to(train_device)
+        num_train = len(y_train_t)
+        # CUDA graphs are captured per input shape, so a compiled model skips the
+        # ragged last batch (the permutation changes every epoch, so no sample is lost)
+        num_batched = num_train
+        if self.compile_model and num_train >= self.batch_size:
+            num_batched -= num_train % self.batch_size
+
+        # Stage the validation set on the device once (when it fits) instead of
+        # reloading it every epoch
+        x_val_t: torch.Tensor | None = None
+        y_val_t: torch.Tensor | None = None
+        val_weight_sum: torch.Tensor | None = None
         if x_val is not None and y_val is not None:
-            val_dataset = TensorDataset(
-                torch.FloatTensor(x_val),
-                torch.LongTensor(y_val),
-            )
-            val_loader = DataLoader(val_dataset, batch_size=self.batch_size, shuffle=False)
+            x_val_t = torch.as_tensor(x_val, dtype=torch.float32)
+            y_val_t = torch.as_tensor(y_val, dtype=torch.long)
+            if self._fits_on_device(x_val_t, y_val_t):
+                x_val_t = x_val_t.to(self.device)
+                y_val_t = y_val_t.to(self.device)
+            # Denominator of the weighted mean loss over the whole set
+            val_weight_sum = weights[y_val_t.to(self.device)].sum()
 
         # Training loop
         history: dict[str, list[float]] = {"train_loss": [], "val_loss": [], "val_acc": []}
@@ -147,48 +315,56 @@ class LSTMTrainer:
         for epoch in range(self.epochs):
             # Training phase
             self.model.train()
-            train_losses = []
-
-            for x_batch, y_batch in train_loader:
-                x_batch = x_batch.to(self.device)
-                y_batch = y_batch.to(self.device)
-
-                optimizer.zero_grad()
-                outputs = self.model(x_batch)
-                loss = criterion(outputs, y_batch)
-                loss.backward()
-
-                # Gradient clipping
-                torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-
-                optimizer.step()
-                train_losses.append(loss.item())
-
-            avg_train_loss = float(np.mean(train_losses))
+            # Accumulate on-device; a single .item() per epoch avoids a sync per step
+            train_loss_sum = torch.zeros((), device=self.device)
+            n_steps = 0
+
+            perm = torch.randperm(num_train, device=train_device)
+            for start in range(0, num_batched, self.batch_size):
+                idx = perm[start : start + self.batch_size]
+                x_batch = x_train_t.index_select(0, idx).to(self.device)
+                y_batch = y_train_t.index_select(0, idx).to(self.device)
+
+                optimizer.zero_grad(set_to_none=True)
+                with self._autocast():
+                    outputs = forward(x_batch)
+                    loss = criterion(outputs, y_batch)
+                scaler.scale(loss).backward()
+
+                # Gradient clipping (on unscaled gradients), one fused norm on CUDA
+                scaler.unscale_(optimizer)
+                torch.nn.utils.clip_grad_norm_(
+                    self.model.parameters(), max_norm=1.0, foreach=foreach
+                )
+
+                scaler.step(optimizer)
+                scaler.update()
+                train_loss_sum += loss.detach()
+                n_steps += 1
+
+            avg_train_loss = (train_loss_sum / n_steps).item()
             history["train_loss"].append(avg_train_loss)
 
             # Validation phase
-            if val_loader is not None:
+            if x_val_t is not None and y_val_t is not None and val_weight_sum is not None:
                 self.model.eval()
-                val_losses = []
-                correct = 0
-                total = 0
+                val_loss_sum = torch.zeros((), device=self.device)
+                correct_sum = torch.zeros((), dtype=torch.long, device=self.device)
 
-                with torch.no_grad():
-                    for x_batch, y_batch in val_loader:
-                        x_batch = x_batch.to(self.device)
-                        y_batch = y_batch.to(self.device)
+                with torch.inference_mode():
+                    for start in range(0, len(y_val_t), VAL_CHUNK_SIZE):
+                        x_chunk = x_val_t[start : start + VAL_CHUNK_SIZE].to(self.device)
+                        y_chunk = y_val_t[start : start + VAL_CHUNK_SIZE].to(self.device)
 
-                        outputs = self.model(x_batch)
-                        loss = criterion(outputs, y_batch)
-                        val_losses.append(loss.item())
+                        with self._autocast():
+                            outputs = self.model(x_chunk)
+                            val_loss_sum += val_criterion(outputs, y_chunk)
 
                         _, predicted = torch.max(outputs.data, 1)
-                        total += y_batch.size(0)
-                        correct += (predicted == y_batch).sum().item()
+                        correct_sum += (predicted == y_chunk).sum()
 
-                avg_val_loss = float(np.mean(val_losses))
-                val_acc = correct / total
+                avg_val_loss = (val_loss_sum / val_weight_sum).item()
+                val_acc = correct_sum.item() / len(y_val_t)
                 history["val_loss"].append(avg_val_loss)
                 history["val_acc"].append(val_acc)
 
@@ -198,7 +374,8 @@ class LSTMTrainer:
                 if avg_val_loss < best_val_loss:
                     best_val_loss = avg_val_loss
                     patience_counter = 0
-                    best_state = {k: v.cpu().clone() for k, v in self.model.state_dict().items()}
+                    # Snapshot stays on the device; no D2H copy or sync per improvement
+                    best_state = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
                 else:
                     patience_counter += 1
 
@@ -245,11 +422,13 @@ class LSTMTrainer:
             "hidden_size": self.hidden_size,
             "num_layers": self.num_layers,
             "sequence_length": self.sequence_length,
-            "trained_at": datetime.utcnow().isoformat(),
+            "trained_at": datetime.now(UTC).isoformat(),
         }
 
-        with open(path / "metadata.json", "w") as f:
-            json.dump(metadata, f, indent=2)
+        if orjson is not None:
+            (path / "metadata.json").write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        else:
+            (path / "metadata.json").write_text(json.dumps(metadata, indent=2))
 
     def evaluate(self, x_test: np.ndarray, y_test: np.ndarray) -> dict:
         """Evaluate model on test set."""
@@ -258,26 +437,26 @@ class LSTMTrainer:
 
         self.model.eval()
 
-        with torch.no_grad():
-            x_tensor = torch.FloatTensor(x_test).to(self.device)
-            y_tensor = torch.LongTensor(y_test).to(self.device)
+        with torch.inference_mode():
+            x_tensor = torch.from_numpy(np.ascontiguousarray(x_test, dtype=np.float32))
+            y_tensor = torch.from_numpy(np.ascontiguousarray(y_test, dtype=np.int64))
+            x_tensor = x_tensor.to(self.device)
+            y_tensor = y_tensor.to(self.device)
 
             outputs = self.model(x_tensor)
             _, predicted = torch.max(outputs.data, 1)
 
-            accuracy = (predicted == y_tensor).sum().item() / len(y_tensor)
+            hits = predicted == y_tensor
+            accuracy = hits.sum().item() / len(y_tensor)
 
-            # Per-class accuracy
+            # Per-class accuracy: samples and hits per label, one bincount each
             class_names = ["DOWN", "SIDEWAYS", "UP"]
-            class_acc = {}
-            for i, name in enumerate(class_names):
-                mask = y_tensor == i
-                if mask.sum() > 0:
-                    class_acc[name] = (
-                        (predicted[mask] == y_tensor[mask]).sum().item() / mask.sum().item()
-                    )
-                else:
-                    class_acc[name] = 0.0
+            counts = torch.bincount(y_tensor, minlength=3).tolist()
+            correct = torch.bincount(y_tensor, weights=hits.double(), minlength=3).tolist()
+            class_acc = {
+                name: c / n if n > 0 else 0.0
+                for name, c, n in zip(class_names, correct, counts, strict=True)
+            }
 
         return {
             "accuracy": accuracy,
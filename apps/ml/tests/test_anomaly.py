@@ -24,9 +24,10 @@ class TestAnomalyDetector:
 
     def test_detect_price_spike(self):
         """Test detection of abnormal price movement."""
+        rng = np.random.default_rng(1)
         # Normal prices with a spike at the end
         prices = np.concatenate([
-            np.random.normal(100, 1, 25),  # Normal variation
+            rng.normal(100, 1, 25),  # Normal variation
             np.array([120.0]),  # Big spike
         ])
         
@@ -40,9 +41,10 @@ class TestAnomalyDetector:
 
     def test_detect_volume_spike(self):
         """Test detection of abnormal volume."""
+        rng = np.random.default_rng(2)
         # Normal volumes with a spike
         volumes = np.concatenate([
-            np.random.normal(1000000, 100000, 25),
+            rng.normal(1000000, 100000, 25),
             np.array([5000000]),  # 5x normal
         ])
         
@@ -53,8 +55,9 @@ class TestAnomalyDetector:
 
     def test_detect_volatility_explosion(self):
         """Test detection of abnormal volatility."""
+        rng = np.random.default_rng(3)
         # Normal volatility followed by high volatility
-        closes = np.cumsum(np.random.normal(0, 1, 30)) + 100
+        closes = np.cumsum(rng.normal(0, 1, 30)) + 100
         highs = closes + np.concatenate([np.full(25, 1), np.array([10, 10, 10, 10, 10])])
         lows = closes - np.concatenate([np.full(25, 1), np.array([10, 10, 10, 10, 10])])
         
@@ -66,11 +69,11 @@ class TestAnomalyDetector:
 
     def test_detect_gap_anomaly(self):
         """Test detection of abnormal gaps."""
-        np.random.seed(42)
-        closes = np.cumsum(np.random.normal(0, 0.5, 30)) + 100
+        rng = np.random.default_rng(42)
+        closes = np.cumsum(rng.normal(0, 0.5, 30)) + 100
         # Normal opens close to previous close, then big gap at end
         opens = np.concatenate([
-            closes[:-1] + np.random.normal(0, 0.2, 29),
+            closes[:-1] + rng.normal(0, 0.2, 29),
         ])
         opens = np.append(opens, closes[-2] + 10)  # Big gap up
         
@@ -82,12 +85,13 @@ class TestAnomalyDetector:
 
     def test_detect_all(self):
         """Test combined anomaly detection."""
+        rng = np.random.default_rng(4)
         n = 30
-        prices = np.cumsum(np.random.normal(0, 1, n)) + 100
-        volumes = np.random.normal(1000000, 100000, n)
-        highs = prices + np.abs(np.random.normal(0, 1, n))
-        lows = prices - np.abs(np.random.normal(0, 1, n))
-        opens = prices + np.random.normal(0, 0.5, n)
+        prices = np.cumsum(rng.normal(0, 1, n)) + 100
+        volumes = rng.normal(1000000, 100000, n)
+        highs = prices + np.abs(rng.normal(0, 1, n))
+        lows = prices - np.abs(rng.normal(0, 1, n))
+        opens = prices + rng.normal(0, 0.5, n)
 
         # Add anomaly
         prices[-1] = prices[-2] * 1.15  # 15% spike
@@ -103,9 +107,10 @@ class TestAnomalyDetector:
 
     def test_anomaly_score(self):
         """Test overall anomaly score calculation."""
+        rng = np.random.default_rng(5)
         # Normal data
-        normal_prices = np.cumsum(np.random.normal(0, 1, 100)) + 100
-        normal_volumes = np.random.normal(1000000, 100000, 100)
+        normal_prices = np.cumsum(rng.normal(0, 1, 100)) + 100
+        normal_volumes = rng.normal(1000000, 100000, 100)
 
         score_normal = self.detector.compute_anomaly_score(
             "TEST", normal_prices, normal_volumes
@@ -138,8 +143,8 @@ class TestIsolationForestDetector:
         detector = IsolationForestDetector(contamination=0.1)
 
         # Generate training data
-        np.random.seed(42)
-        normal_data = np.random.normal(0, 1, (100, 5))
+        rng = np.random.default_rng(42)
+        normal_data = rng.normal(0, 1, (100, 5))
         
         detector.fit(normal_data)
         
@@ -147,7 +152,7 @@ class TestIsolationForestDetector:
         normal_preds = detector.predict(normal_data[:10])
         
         # Predict on anomalous data
-        anomalous_data = np.random.normal(10, 1, (10, 5))  # Different distribution
+        anomalous_data = rng.normal(10, 1, (10, 5))  # Different distribution
         anomalous_preds = detector.predict(anomalous_data)
         
         # Most normal data should be predicted as normal (1)
@@ -160,8 +165,8 @@ class TestIsolationForestDetector:
         """Test anomaly scoring."""
         detector = IsolationForestDetector()
         
-        np.random.seed(42)
-        normal_data = np.random.normal(0, 1, (100, 5))
+        rng = np.random.default_rng(42)
+        normal_data = rng.normal(0, 1, (100, 5))
         detector.fit(normal_data)
         
         scores = detector.score_samples(normal_data[:10])
@@ -171,9 +176,10 @@ class TestIsolationForestDetector:
 
     def test_not_fitted(self):
         """Test behavior when not fitted."""
+        rng = np.random.default_rng(6)
         detector = IsolationForestDetector()
         
-        data = np.random.normal(0, 1, (10, 5))
+        data = rng.normal(0, 1, (10, 5))
         predictions = detector.predict(data)
         
         # Should return all 1s (normal) when not fitted
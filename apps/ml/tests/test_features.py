@@ -11,20 +11,20 @@ from jejakcuan_ml.features.sequence import DataSplitter
 @pytest.fixture
 def sample_ohlcv() -> pd.DataFrame:
     """Create sample OHLCV data."""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n = 100
 
     # Generate random walk price data
-    returns = np.random.randn(n) * 0.02
+    returns = rng.standard_normal(n) * 0.02
     close = 1000 * np.exp(np.cumsum(returns))
 
     df = pd.DataFrame(
         {
-            "open": close * (1 + np.random.randn(n) * 0.005),
-            "high": close * (1 + np.abs(np.random.randn(n)) * 0.01),
-            "low": close * (1 - np.abs(np.random.randn(n)) * 0.01),
+            "open": close * (1 + rng.standard_normal(n) * 0.005),
+            "high": close * (1 + np.abs(rng.standard_normal(n)) * 0.01),
+            "low": close * (1 - np.abs(rng.standard_normal(n)) * 0.01),
             "close": close,
-            "volume": np.random.randint(1000000, 10000000, n),
+            "volume": rng.integers(1000000, 10000000, n),
         }
     )
 
@@ -65,7 +65,7 @@ class TestSequenceBuilder:
     def test_build_sequences(self, sample_ohlcv: pd.DataFrame) -> None:
         extractor = TechnicalFeatureExtractor()
         features = extractor.extract(sample_ohlcv).values
-        labels = np.random.randint(0, 3, len(features))
+        labels = np.random.default_rng(0).integers(0, 3, len(features))
 
         builder = SequenceBuilder(sequence_length=30)
         x_seqs, y_seqs = builder.build_sequences(features, labels)
@@ -90,8 +90,9 @@ class TestDataSplitter:
     """Tests for DataSplitter."""
 
     def test_split_temporal(self) -> None:
-        features = np.random.randn(100, 30, 10)
-        labels = np.random.randint(0, 3, 100)
+        rng = np.random.default_rng(0)
+        features = rng.standard_normal((100, 30, 10))
+        labels = rng.integers(0, 3, 100)
 
         (train_feat, _), (val_feat, _), (test_feat, _) = DataSplitter.split_temporal(
             features, labels, train_ratio=0.7, val_ratio=0.15
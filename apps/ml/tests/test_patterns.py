@@ -21,6 +21,31 @@ class TestDTWPatternMatcher:
         distance = self.matcher.dtw_distance(seq, seq)
         assert distance == 0.0
 
+    def test_dtw_distance_cutoff(self):
+        """Test that pruning against a cutoff keeps distances within it exact."""
+        rng = np.random.default_rng(2)
+        seq1 = rng.normal(0, 1, 30)
+        seq2 = seq1 + rng.normal(0, 0.1, 30)
+
+        exact = self.matcher.dtw_distance(seq1, seq2)
+        assert self.matcher.dtw_distance(seq1, seq2, cutoff=np.inf) == exact
+        assert self.matcher.dtw_distance(seq1, seq2, cutoff=exact * 1.01) == exact
+        assert self.matcher.dtw_distance(seq1, seq2, cutoff=exact * 0.99) == np.inf
+
+    def test_dtw_kernel_compiled(self):
+        """Test that the numba-compiled DTW kernel matches its Python source."""
+        pytest.importorskip("numba")
+        from jejakcuan_ml.patterns import _dtw_numba
+
+        assert _dtw_numba.HAS_NUMBA
+        rng = np.random.default_rng(4)
+        for band, cutoff in [(-1, np.inf), (3, np.inf), (5, 4.0), (0, 10.0)]:
+            seq1 = rng.normal(0, 1, 25)
+            seq2 = rng.normal(0, 1, 25)
+            compiled = _dtw_numba.dtw_core(seq1, seq2, band, cutoff)
+            expected = _dtw_numba.dtw_core.py_func(seq1, seq2, band, cutoff)
+            assert compiled == pytest.approx(expected)
+
     def test_dtw_distance_similar(self):
         """Test DTW distance for similar sequences."""
         seq1 = np.array([1, 2, 3, 4, 5])
@@ -103,9 +128,34 @@ class TestDTWPatternMatcher:
         
         assert len(matches) >= 0
 
+    def test_lb_prefilter_keeps_matches(self):
+        """Test that the LB_Keogh prefilter does not change the matches."""
+        prices = np.cumsum(np.random.default_rng(1).normal(0, 1, 200)) + 100
+
+        for threshold in (0.7, 0.95):
+            filtered = DTWPatternMatcher(similarity_threshold=threshold).find_patterns(prices)
+            exhaustive = DTWPatternMatcher(
+                similarity_threshold=threshold, lb_prefilter=False
+            ).find_patterns(prices)
+
+            assert filtered == exhaustive
+
+    def test_fp32_precision_matches_fp64(self):
+        """Test that float32 search finds the same matches as float64."""
+        prices = np.cumsum(np.random.default_rng(3).normal(0, 1, 200)) + 100
+
+        fp64 = DTWPatternMatcher().find_patterns(prices)
+        fp32 = DTWPatternMatcher(precision="fp32").find_patterns(prices)
+
+        assert [(m.pattern_type, m.start_idx) for m in fp32] == [
+            (m.pattern_type, m.start_idx) for m in fp64
+        ]
+        for a, b in zip(fp32, fp64):
+            assert a.similarity == pytest.approx(b.similarity, abs=1e-5)
+
     def test_match_single_pattern(self):
         """Test matching specific pattern type."""
-        prices = np.random.normal(100, 5, 50)  # Random prices
+        prices = np.random.default_rng(0).normal(100, 5, 50)  # Random prices
         
         match = self.matcher.match_single_pattern(prices, PatternType.ACCUMULATION)
         
@@ -218,3 +268,13 @@ class TestPatternLibrary:
         for pattern in self.library.patterns:
             assert np.min(pattern.template) >= 0.0
             assert np.max(pattern.template) <= 1.0
+
+    def test_resampled_template_memoized(self):
+        """Test that resampled templates are computed once per window size."""
+        pattern = self.library.patterns[0]
+        resampled = self.library.resampled_template(pattern, 30)
+
+        assert len(resampled) == 30
+        assert resampled[0] == pattern.template[0]
+        assert resampled[-1] == pattern.template[-1]
+        assert self.library.resampled_template(pattern, 30) is resampled
@@ -0,0 +1,372 @@
+"""Tests for scrapers."""
+
+import asyncio
+import os
+import sys
+import types
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import aiofiles.os
+import httpx
+import pandas as pd
+import pytest
+
+from jejakcuan_ml.scrapers import base
+from jejakcuan_ml.scrapers.base import BaseScraper, HostRateLimiter, ScraperConfig
+from jejakcuan_ml.scrapers.cache import ResponseCache
+from jejakcuan_ml.scrapers.news_scraper import NewsItem, NewsScraper
+from jejakcuan_ml.scrapers.price_history import PriceHistoryScraper
+
+
+class _Scraper(BaseScraper):
+    """Minimal concrete scraper for exercising BaseScraper."""
+
+    async def scrape(self) -> int:
+        return 0
+
+    def get_name(self) -> str:
+        return "Test"
+
+
+class FakeClock:
+    """Stand-in for the ``time`` module whose sleeps advance the clock."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the scraper clock and sleeps with a fake one."""
+    fake = FakeClock()
+    monkeypatch.setattr(base, "time", fake)
+    monkeypatch.setattr(asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def _scraper(**config: object) -> _Scraper:
+    """Scraper without jitter or a real database."""
+    return _Scraper(ScraperConfig(min_delay=0, max_delay=0, **config), db_client=MagicMock())  # type: ignore[arg-type]
+
+
+class TestHostRateLimiter:
+    """Tests for per-host request spacing."""
+
+    def test_slots_are_spaced(self, clock: FakeClock) -> None:
+        """Test that back-to-back reservations are one interval apart."""
+        limiter = HostRateLimiter(requests_per_minute=60)
+
+        assert [limiter.delay() for _ in range(3)] == [0.0, 1.0, 2.0]
+
+    def test_idle_time_is_not_banked(self, clock: FakeClock) -> None:
+        """Test that an idle host does not allow a burst afterwards."""
+        limiter = HostRateLimiter(requests_per_minute=30)
+        limiter.delay()
+        clock.now += 60
+
+        assert [limiter.delay() for _ in range(2)] == [0.0, 2.0]
+
+    def test_block_for_extends_only(self, clock: FakeClock) -> None:
+        """Test that a block pushes the next slot out but never pulls it in."""
+        limiter = HostRateLimiter(requests_per_minute=60)
+        limiter.block_for(10)
+        limiter.block_for(3)
+
+        assert limiter.delay() == 10.0
+        assert limiter.delay() == 11.0
+
+
+class TestBaseScraperRateLimit:
+    """Tests for rate limiting in BaseScraper."""
+
+    async def test_hosts_are_limited_separately(self, clock: FakeClock) -> None:
+        """Test that requests to one host do not delay another host."""
+        scraper = _scraper(requests_per_minute=60)
+
+        await scraper._rate_limit("https://a.example/1")
+        await scraper._rate_limit("https://a.example/2")
+        await scraper._rate_limit("https://b.example/1")
+
+        assert clock.sleeps == [1.0]
+        assert scraper._limiter("https://a.example/3") is scraper._limiter("https://a.example/")
+        assert scraper._limiter("https://a.example/") is not scraper._limiter("https://b.example/")
+
+    def test_host_budget_override(self, clock: FakeClock) -> None:
+        """Test that configured hosts get their own request budget."""
+        scraper = _scraper(requests_per_minute=30)
+
+        assert scraper._limiter("https://query1.finance.yahoo.com/v8").interval == 0.6
+        assert scraper._limiter("https://www.idx.co.id/primary").interval == 2.0
+
+    @pytest.mark.parametrize(
+        ("headers", "blocked"),
+        [
+            ({"Retry-After": "30"}, 30.0),
+            ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "20"}, 20.0),
+            ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1000000045"}, None),
+            ({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "20"}, 0.0),
+            ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+        ],
+    )
+    def test_update_from_headers(
+        self, clock: FakeClock, headers: dict[str, str], blocked: float | None
+    ) -> None:
+        """Test that rate-limit headers hold back the host."""
+        if blocked is None:
+            # Epoch reset 45 seconds from now
+            clock.now = 1_000_000_000.0
+            blocked = 45.0
+        scraper = _scraper()
+        url = "https://a.example/1"
+
+        scraper._update_rate_limit(url, httpx.Response(200, headers=headers))
+
+        assert scraper._limiter(url).delay() == pytest.approx(blocked)
+
+    async def test_429_blocks_the_host(self, clock: FakeClock) -> None:
+        """Test that a 429 backs off every request to the host."""
+        statuses = iter([429, 429, 200])
+        scraper = _scraper(requests_per_minute=60, retry_delay=5.0)
+        scraper._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses)))
+        )
+
+        response = await scraper._fetch_url("https://a.example/1")
+
+        assert response is not None and response.status_code == 200
+        # Backoff of 5s then 10s, each replacing the 1s spacing
+        assert clock.sleeps == [5.0, 10.0]
+        await scraper._client.aclose()
+
+
+class TestFetchCoalescing:
+    """Tests for sharing in-flight identical requests."""
+
+    @staticmethod
+    def _scraper(calls: list[httpx.Request]) -> _Scraper:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"n": len(calls)})
+
+        scraper = _scraper(requests_per_minute=6000)
+        scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return scraper
+
+    async def test_identical_gets_share_one_call(self) -> None:
+        """Test that concurrent identical GETs hit the transport once."""
+        calls: list[httpx.Request] = []
+        scraper = self._scraper(calls)
+        url = "https://a.example/api"
+
+        first, second = await asyncio.gather(
+            scraper._fetch_url(url, params={"q": "BBCA", "page": 1}),
+            scraper._fetch_url(url, params=[("page", 1), ("q", "BBCA")]),
+        )
+
+        assert len(calls) == 1
+        assert first is second
+        assert scraper._inflight == {}
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"params": httpx.QueryParams({"q": "BBRI"})},
+            {"params": {"q": "BBCA"}, "headers": {"X-Page": "2"}},
+        ],
+    )
+    async def test_different_requests_are_not_shared(self, kwargs: dict[str, object]) -> None:
+        """Test that other params or extra request options are fetched separately."""
+        calls: list[httpx.Request] = []
+        scraper = self._scraper(calls)
+        url = "https://a.example/api"
+
+        await asyncio.gather(
+            scraper._fetch_url(url, params={"q": "BBCA"}),
+            scraper._fetch_url(url, **kwargs),  # type: ignore[arg-type]
+        )
+
+        assert len(calls) == 2
+
+
+class TestPriceHistoryFallback:
+    """Tests for the Yahoo Finance to IDX fallback decision."""
+
+    @pytest.fixture
+    def ticker(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        """Install a fake yfinance whose Ticker returns an empty frame."""
+        ticker = MagicMock()
+        ticker.history.return_value = pd.DataFrame()
+        yf = types.ModuleType("yfinance")
+        yf.Ticker = MagicMock(return_value=ticker)  # type: ignore[attr-defined]
+        monkeypatch.setitem(sys.modules, "yfinance", yf)
+        return ticker
+
+    @pytest.fixture
+    def scraper(self) -> PriceHistoryScraper:
+        scraper = PriceHistoryScraper(db_client=MagicMock())
+        scraper._fetch_idx_api = AsyncMock(return_value=[])  # type: ignore[method-assign]
+        return scraper
+
+    async def test_yahoo_errors_are_raised(
+        self, ticker: MagicMock, scraper: PriceHistoryScraper
+    ) -> None:
+        """Test that yfinance is asked to raise instead of returning an empty frame."""
+        await scraper._fetch_yahoo_finance("BBCA", date(2024, 1, 1), date(2024, 2, 1))
+        assert ticker.history.call_args.kwargs["raise_errors"] is True
+
+    async def test_yahoo_error_falls_back(
+        self, ticker: MagicMock, scraper: PriceHistoryScraper
+    ) -> None:
+        """Test that a Yahoo failure tries the IDX API."""
+        ticker.history.side_effect = RuntimeError("rate limited")
+
+        await scraper._fetch_prices("BBCA", date(2024, 1, 1), date(2024, 2, 1))
+
+        scraper._fetch_idx_api.assert_awaited_once()  # type: ignore[attr-defined]
+
+    async def test_empty_frame_with_history_does_not_fall_back(
+        self, ticker: MagicMock, scraper: PriceHistoryScraper
+    ) -> None:
+        """Test that an empty window for a known symbol is not retried on IDX."""
+        await scraper._fetch_prices("BBCA", date(2024, 1, 1), date(2024, 2, 1))
+
+        scraper._fetch_idx_api.assert_not_awaited()  # type: ignore[attr-defined]
+
+    async def test_empty_frame_without_history_falls_back(
+        self, ticker: MagicMock, scraper: PriceHistoryScraper
+    ) -> None:
+        """Test that a symbol Yahoo has nothing for is tried on IDX."""
+        await scraper._fetch_prices("BBCA", date(2024, 1, 1), date(2024, 2, 1), has_history=False)
+
+        scraper._fetch_idx_api.assert_awaited_once()  # type: ignore[attr-defined]
+
+
+class TestNewsSave:
+    """Tests for saving scraped news."""
+
+    @staticmethod
+    def _item(n: int) -> NewsItem:
+        return NewsItem(
+            symbol="BBCA",
+            title=f"Berita {n}",
+            summary=None,
+            source="kontan",
+            url=f"https://kontan.co.id/{n}",
+            published_at=datetime(2024, 1, 1),
+            keywords=[],
+        )
+
+    def test_batch_insert(self) -> None:
+        """Test that all items go to the database in one call."""
+        db = MagicMock()
+        db.insert_news_batch.return_value = 3
+        scraper = NewsScraper(db_client=db)
+
+        assert scraper._save_news([self._item(n) for n in range(3)]) == 3
+        db.insert_news_batch.assert_called_once()
+
+    def test_batch_failure_falls_back_to_single_inserts(self) -> None:
+        """Test that a failed batch only loses the rows that fail on their own."""
+        db = MagicMock()
+
+        def insert(rows: list[dict[str, object]]) -> int:
+            if len(rows) > 1 or rows[0]["title"] == "Berita 1":
+                raise RuntimeError("constraint violation")
+            return 1
+
+        db.insert_news_batch.side_effect = insert
+        scraper = NewsScraper(db_client=db)
+
+        assert scraper._save_news([self._item(n) for n in range(3)]) == 2
+        assert db.insert_news_batch.call_count == 4
+
+
+class TestResponseCache:
+    """Tests for the on-disk response cache."""
+
+    @staticmethod
+    def _response(body: bytes = b'{"ok": true}') -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json"},
+            content=body,
+            request=httpx.Request("GET", "https://example.com/api"),
+        )
+
+    async def test_roundtrip(self, tmp_path: Path) -> None:
+        """Test that a stored response is served back."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        key = cache.make_key("GET", "https://example.com/api", {"b": 2, "a": 1})
+        await cache.set(key, self._response())
+
+        cached = await cache.get(key)
+
+        assert cached is not None
+        assert cached.status_code == 200
+        assert cached.content == b'{"ok": true}'
+        assert cached.headers["content-type"] == "application/json"
+        assert key == cache.make_key("GET", "https://example.com/api", {"a": 1, "b": 2})
+
+    async def test_expired_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test that entries older than the TTL are ignored."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        await cache.set("key", self._response())
+        old = os.path.getmtime(tmp_path / "key.bin") - 120
+        os.utime(tmp_path / "key.bin", (old, old))
+
+        assert await cache.get("key") is None
+
+    async def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test that unparseable entries are ignored."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        (tmp_path / "bad.bin").write_bytes(b"not json\nbody")
+        (tmp_path / "partial.bin").write_bytes(b'{"status": 200}\nbody')
+
+        assert await cache.get("bad") is None
+        assert await cache.get("partial") is None
+
+    async def test_unreadable_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test that I/O errors other than a missing file are a miss."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        (tmp_path / "dir.bin").mkdir()
+
+        assert await cache.get("dir") is None
+
+    async def test_concurrent_sets_of_one_key(self, tmp_path: Path) -> None:
+        """Test that concurrent writes of one key do not share a temp file."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        bodies = [bytes([65 + i]) * 100_000 for i in range(8)]
+
+        await asyncio.gather(*(cache.set("key", self._response(b)) for b in bodies))
+
+        cached = await cache.get("key")
+        assert cached is not None
+        assert cached.content in bodies
+        assert [p.name for p in tmp_path.iterdir()] == ["key.bin"]
+
+    async def test_write_failure_is_ignored(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failed store is logged and cleaned up instead of raised."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        monkeypatch.setattr(aiofiles.os, "replace", AsyncMock(side_effect=OSError("disk full")))
+
+        await cache.set("key", self._response())
+
+        assert list(tmp_path.iterdir()) == []
+        assert await cache.get("key") is None
@@ -6,9 +6,9 @@ from fastapi.testclient import TestClient
 from jejakcuan_ml.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client."""
+    """Create test client shared by the whole session."""
     return TestClient(app)
 
 
@@ -1,7 +1,12 @@
 """Tests for Telegram monitoring module."""
 
+import functools
+from datetime import datetime
+
 import pytest
-from jejakcuan_ml.telegram.parser import TelegramMessageParser, ParsedStockMention
+
+from jejakcuan_ml.telegram.monitor import MonitorConfig, TelegramMessage, TelegramMonitor
+from jejakcuan_ml.telegram.parser import ParsedStockMention, TelegramMessageParser
 
 
 class TestTelegramParser:
@@ -92,3 +97,96 @@ class TestTelegramParser:
         intensity = self.parser.get_message_intensity(extreme)
         
         assert 0 <= intensity <= 1
+
+    def test_extract_symbols_non_ticker_prefix(self):
+        """Test that non-ticker words only exclude exact matches."""
+        symbols = self.parser.extract_symbols("HARI ini HARIS dan SAMAS, bukan SAMA")
+        assert symbols == []
+        assert self.parser.extract_symbols("PAGI PAGE") == ["PAGE"]
+
+    def test_extract_mentions_context_non_ascii(self):
+        """Test that the context window is not shifted by case-folding length changes."""
+        text = "İİİİİİ info: BBCA naik kuat hari ini, target 10000 jual rugi lemah turun"
+        mentions = self.parser.extract_mentions(text)
+
+        assert len(mentions) == 1
+        assert mentions[0].context == "İİİİİİ info: BBCA naik kuat hari ini, target 10"
+        assert mentions[0].sentiment_hint == "bullish"
+
+    def test_sentiment_hint_matches_whole_words(self):
+        """Test that sentiment keywords are not matched inside other words."""
+        # "up" in "update" and "loss" in "glossy" are not keywords
+        assert self.parser._detect_sentiment_hint("bbca update glossy") is None
+        assert self.parser._detect_sentiment_hint("bbca up, tidak loss") is None
+        assert self.parser._detect_sentiment_hint("bbca net buy asing") == "bullish"
+        assert self.parser._detect_sentiment_hint("bbca cut loss") == "bearish"
+
+    def test_message_intensity_non_ascii_caps(self):
+        """Test that only ASCII capitals count towards the caps ratio."""
+        text = "BBCA " + "éà" * 10
+        assert self.parser.get_message_intensity(text) == pytest.approx(4 / 25)
+        assert self.parser.get_message_intensity("ÀÉÎÕÜ") == 0.0
+
+
+class TestTelegramMonitor:
+    """Tests for TelegramMonitor handler dispatch."""
+
+    def setup_method(self):
+        self.monitor = TelegramMonitor(MonitorConfig(api_id="1", api_hash="hash"))
+        self.msg = TelegramMessage(
+            message_id=1,
+            channel_id="1",
+            channel_name="sahamology",
+            text="$BBCA naik",
+            timestamp=datetime(2024, 1, 1),
+        )
+
+    async def test_dispatch_sync_and_async_handlers(self):
+        """Test that sync, async and async callable handlers all receive the message."""
+        received = []
+
+        async def on_async(msg):
+            received.append(("async", msg.message_id))
+
+        class AsyncCallable:
+            async def __call__(self, msg):
+                received.append(("callable", msg.message_id))
+
+        async def tagged(tag, msg):
+            received.append((tag, msg.message_id))
+
+        self.monitor.add_handler(lambda msg: received.append(("sync", msg.message_id)))
+        self.monitor.add_handler(on_async)
+        self.monitor.add_handler(AsyncCallable())
+        self.monitor.add_handler(functools.partial(tagged, "partial"))
+
+        await self.monitor._dispatch(self.msg)
+
+        assert sorted(received) == [
+            ("async", 1),
+            ("callable", 1),
+            ("partial", 1),
+            ("sync", 1),
+        ]
+
+    async def test_dispatch_isolates_failing_handlers(self):
+        """Test that a failing handler does not stop the others."""
+        received = []
+
+        def broken(msg):
+            raise RuntimeError("boom")
+
+        async def broken_async(msg):
+            raise RuntimeError("boom")
+
+        async def on_async(msg):
+            received.append("async")
+
+        self.monitor.add_handler(broken)
+        self.monitor.add_handler(broken_async)
+        self.monitor.add_handler(lambda msg: received.append("sync"))
+        self.monitor.add_handler(on_async)
+
+        await self.monitor._dispatch(self.msg)
+
+        assert sorted(received) == ["async", "sync"]
@@ -2,29 +2,24 @@
 """Generate Argon2 password hash for JejakCuan API."""
 
 import argparse
-import secrets
-import base64
-import hashlib
+import sys
 
 try:
     from argon2 import PasswordHasher
-    
-    def generate_hash(password: str) -> str:
-        ph = PasswordHasher()
-        return ph.hash(password)
-        
 except ImportError:
-    print("Note: argon2-cffi not installed, using compatible hash format")
-    print("Install with: pip install argon2-cffi")
-    
-    def generate_hash(password: str) -> str:
-        # This is a placeholder - in production use proper argon2
-        salt = secrets.token_bytes(16)
-        salt_b64 = base64.b64encode(salt).decode().rstrip('=')
-        # Use PBKDF2 as fallback (not ideal but works for demo)
-        hash_bytes = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
-        hash_b64 = base64.b64encode(hash_bytes).decode().rstrip('=')
-        return f"$argon2id$v=19$m=19456,t=2,p=1${salt_b64}${hash_b64}"
+    # The API (apps/api/src/auth.rs) only verifies Argon2, so any other hash
+    # printed here would lock the user out
+    sys.exit(
+        "Error: argon2-cffi is not installed and the API only accepts Argon2 hashes\n"
+        "Install with: pip install argon2-cffi"
+    )
+
+_PASSWORD_HASHER = PasswordHasher()
+
+
+def generate_hash(password: str) -> str:
+    return _PASSWORD_HASHER.hash(password)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate password hash")